@@ -0,0 +1,815 @@
+"""数据中心电力-算力协同调度命令行入口
+
+用法示例：
+    python -m cli problem1 --attachment1 附件1.xlsx --attachment2 附件2.xlsx
+    python -m cli problem1 --cache cache/测试5.npz      # 直接读缓存，不加载 pandas
+    python -m cli --import-time problem3 --attachment1 附件1.xlsx \
+        --attachment2 附件2.xlsx --plot
+    python -m cli gen --count 10 --seed 0
+    python -m cli report --data-dir 鲁棒性测试数据 --models 1 2 3
+    python -m cli report --models 1 2 3 --save results.npz
+    python -m cli stats --results results.npz --resamples 10000
+    python -m cli jobs --cache cache/测试5.npz --capacity 3000 --scale 1000
+    python -m cli validate --data-dir 鲁棒性测试数据 --capacity 3000
+    python -m cli multisite --data-dir 鲁棒性测试数据 --transfer-cost 0.05 --compare
+    python -m cli storage --model 2 --data-dir 鲁棒性测试数据 --capacity 3000
+    python -m cli lagrangian --cache cache/测试5.npz --pieces 10000
+
+重量级依赖（pandas / matplotlib / PuLP）只在所选路径需要时才导入，
+--import-time 会在 stderr 打印本次运行实际导入的各依赖及其耗时。
+"""
+
+import argparse
+import builtins
+import importlib
+import os
+import sys
+import time
+
+from data_io import cache_file, load_inputs
+
+# 运行期间首次导入的模块：[(模块名, 开始时间, 结束时间)]
+IMPORT_EVENTS = []
+
+
+def record_imports():
+    """包装 builtins.__import__ 和 importlib.import_module，记录运行期间实际发生的
+    导入（包括 pandas 读 Excel 时才导入的 openpyxl 等），返回恢复函数"""
+    original_import = builtins.__import__
+    original_import_module = importlib.import_module
+
+    def timed(load):
+        def wrapper(name, *args, **kwargs):
+            if name.startswith(".") or name in sys.modules:
+                return load(name, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return load(name, *args, **kwargs)
+            finally:
+                IMPORT_EVENTS.append((name, start, time.perf_counter()))
+
+        return wrapper
+
+    def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+        if level:
+            return original_import(name, globals, locals, fromlist, level)
+        return timed_builtin(name, globals, locals, fromlist, level)
+
+    timed_builtin = timed(original_import)
+    builtins.__import__ = timed_import
+    importlib.import_module = timed(original_import_module)
+
+    def restore():
+        builtins.__import__ = original_import
+        importlib.import_module = original_import_module
+
+    return restore
+
+
+def import_times():
+    """各依赖（按顶层包汇总）的导入耗时（秒）
+
+    不计本仓库自己的模块；嵌套在其他导入过程中的子导入已计入外层导入。
+    """
+    here = os.path.dirname(os.path.abspath(__file__))
+    external = []
+    for name, start, end in IMPORT_EVENTS:
+        if name not in sys.modules:
+            continue  # 导入失败（可选依赖）
+        path = getattr(sys.modules[name], "__file__", None)
+        if path and os.path.dirname(os.path.abspath(path)) == here:
+            continue
+        external.append((name, start, end))
+
+    times = {}
+    for i, (name, start, end) in enumerate(external):
+        nested = any(
+            s <= start and end <= e and j != i for j, (_, s, e) in enumerate(external)
+        )
+        if not nested:
+            package = name.partition(".")[0]
+            times[package] = times.get(package, 0.0) + end - start
+    return times
+
+
+def _usage_series(green_usage, total_usage):
+    """每小时绿色能源使用率(%)和传统能源使用量"""
+    usage_rates = [
+        (green_usage[h] / total_usage[h] * 100) if total_usage[h] > 0 else 0
+        for h in range(24)
+    ]
+    trad_usage = [total_usage[h] - green_usage[h] for h in range(24)]
+    return usage_rates, trad_usage
+
+
+def run_storage_model(
+    tradition_price, new_energy_price, new_energy_supply, periods, storage
+):
+    """模型3加储能（storage 见 storage.storage_spec）
+
+    返回总成本、任务的每小时绿电使用率(%)和传统电量，以及储能充放电量
+    （见 problem3.build_and_solve_model 的 return_storage）。
+    """
+    import problem3
+
+    cost, green_usage, total_usage, flows = problem3.build_and_solve_model(
+        tradition_price,
+        new_energy_price,
+        new_energy_supply,
+        *problem3.split_periods(periods),
+        storage=storage,
+        return_storage=True,
+    )
+    return (cost, *_usage_series(green_usage, total_usage), flows)
+
+
+def run_model(model, tradition_price, new_energy_price, new_energy_supply, periods):
+    """运行指定模型，返回总成本、每小时绿色能源使用率(%)和传统能源使用量(千瓦时)"""
+    hours = range(24)
+    if model == "1":
+        import problem1
+
+        hours_tasks = problem1.split_periods(periods)
+        cost, usage_rates, trad_usage = problem1.calculate_cost(
+            tradition_price, new_energy_price, new_energy_supply, hours_tasks
+        )
+    elif model == "2":
+        import problem2
+
+        cost, green_usage, trad_usage = problem2.calculate_cost(
+            tradition_price,
+            new_energy_price,
+            new_energy_supply,
+            *problem2.split_periods(periods),
+        )
+        usage_rates = [green_usage[h] for h in hours]
+        trad_usage = [trad_usage[h] for h in hours]
+    elif model == "3":
+        import problem3
+
+        cost, green_usage, total_usage = problem3.build_and_solve_model(
+            tradition_price,
+            new_energy_price,
+            new_energy_supply,
+            *problem3.split_periods(periods),
+        )
+        usage_rates, trad_usage = _usage_series(green_usage, total_usage)
+    else:
+        raise ValueError(f"未知模型：{model}")
+    return cost, usage_rates, trad_usage
+
+
+def cmd_problem(args):
+    model = args.command[-1]
+    inputs = load_inputs(args.attachment1, args.attachment2, args.cache)
+    flows = None
+    if model == "3" and args.storage_capacity:
+        from storage import storage_spec
+
+        spec = storage_spec(
+            args.storage_capacity,
+            args.storage_power,
+            args.storage_efficiency,
+            grid_charging=args.storage_grid_charging,
+        )
+        cost, usage_rates, trad_usage, flows = run_storage_model(*inputs, spec)
+    else:
+        cost, usage_rates, trad_usage = run_model(model, *inputs)
+
+    if args.plot:
+        plot_results = importlib.import_module(args.command).plot_results
+        if model == "1":
+            plot_results(usage_rates, trad_usage)
+        else:
+            plot_results(usage_rates, dict(enumerate(trad_usage)))
+
+    average_usage = sum(usage_rates) / len(usage_rates)
+    print(f"绿色能源平均利用率：{average_usage:.2f}%")
+    print(f"传统能源总用量：{sum(trad_usage):.2f} 千瓦时")
+    if flows:
+        # 以上两项只统计任务从电网取用的电量，储能充放电单独列出
+        print(
+            f"储能充电：绿电 {sum(flows['charge_green']):.2f} 千瓦时，"
+            f"传统电 {sum(flows['charge_trad']):.2f} 千瓦时；"
+            f"放电 {sum(flows['discharge']):.2f} 千瓦时"
+        )
+        print(
+            "传统能源总用量（含储能充电）："
+            f"{sum(trad_usage) + sum(flows['charge_trad']):.2f} 千瓦时"
+        )
+    print(f"24小时总电力成本为：{cost:.2f} 元")
+    return 0
+
+
+def cmd_gen(args):
+    import problem4_gen
+
+    problem4_gen.generate(args.output_dir, args.count, args.seed)
+    print(f"数据生成完成，请查看'{args.output_dir}'目录")
+    return 0
+
+
+def _collect_results(args):
+    """在各测试场景上运行所选模型，返回 成本[模型][场景] 和 传统电量[模型][场景]"""
+    costs = [[] for _ in args.models]
+    trads = [[] for _ in args.models]
+    for inputs in _scenario_inputs(args):
+        for k, model in enumerate(args.models):
+            cost, _, trad_usage = run_model(model, *inputs)
+            costs[k].append(cost)
+            trads[k].append(sum(trad_usage))
+    return costs, trads
+
+
+def cmd_report(args):
+    costs, trads = _collect_results(args)
+    print("测试\t" + "\t".join(f"模型{m}成本\t模型{m}传统电量" for m in args.models))
+    for i in range(len(costs[0])):
+        cells = [f"{cost[i]:.2f}\t{trad[i]:.2f}" for cost, trad in zip(costs, trads)]
+        print(f"{i + 1}\t" + "\t".join(cells))
+    if args.save:
+        import numpy as np
+
+        np.savez(args.save, models=np.array(args.models), cost=costs, trad=trads)
+    return 0
+
+
+def cmd_stats(args):
+    import numpy as np
+
+    from robust_stats import (
+        bootstrap_ci,
+        bootstrap_samples,
+        paired_differences,
+        summarize,
+    )
+
+    if args.results:
+        with np.load(args.results) as data:
+            models = data["models"].tolist()
+            metrics = {"成本": data["cost"], "传统电量": data["trad"]}
+    else:
+        models = args.models
+        costs, trads = _collect_results(args)
+        metrics = {"成本": np.array(costs), "传统电量": np.array(trads)}
+    names = [f"模型{m}" for m in models]
+
+    # 所有指标堆叠后共用一组重抽样，置信区间和配对差值都取自这一组
+    start = time.perf_counter()
+    stacked = np.vstack(list(metrics.values()))
+    samples = bootstrap_samples(stacked, "mean", args.resamples, args.seed)
+    samples = np.split(samples, len(metrics))
+    elapsed = time.perf_counter() - start
+    print(
+        f"{stacked.shape[1]} 个场景，{args.resamples} 次重抽样，"
+        f"耗时 {elapsed * 1000:.1f} ms"
+    )
+
+    for (label, values), metric_samples in zip(metrics.items(), samples):
+        summary = summarize(values, percentiles=(5, 50, 95), level=args.level)
+        ci = bootstrap_ci(
+            values, "mean", confidence=args.confidence, samples=metric_samples
+        )
+        pairs = paired_differences(
+            values, names, samples=metric_samples, confidence=args.confidence
+        )
+
+        print(f"== {label}")
+        print(
+            f"模型\t均值\t{args.confidence:.0%}置信区间\t标准差\t变异系数"
+            f"\tP5\tP50\tP95\tCVaR{args.level:.0%}"
+        )
+        for k, name in enumerate(names):
+            p5, p50, p95 = summary["percentiles"][k]
+            print(
+                f"{name}\t{summary['mean'][k]:.2f}"
+                f"\t[{ci['low'][k]:.2f}, {ci['high'][k]:.2f}]"
+                f"\t{summary['std'][k]:.2f}\t{summary['cv'][k]:.4f}"
+                f"\t{p5:.2f}\t{p50:.2f}\t{p95:.2f}\t{summary['cvar'][k]:.2f}"
+            )
+        for pair in pairs:
+            print(
+                f"{pair['pair'][0]} - {pair['pair'][1]}：均值差 {pair['mean']:.2f}"
+                f" [{pair['low']:.2f}, {pair['high']:.2f}]，"
+                f"前者更优的场景占 {pair['win_rate']:.1%}"
+            )
+    return 0
+
+
+def cmd_storage(args):
+    import numpy as np
+
+    from storage import dispatch, hourly_load, storage_spec
+
+    scenarios = _scenario_inputs(args)
+
+    hours = range(24)
+    load = [hourly_load(args.model, *inputs) for inputs in scenarios]
+    tradition_price, new_energy_price, new_energy_supply = (
+        [[inputs[k][h] for h in hours] for inputs in scenarios] for k in range(3)
+    )
+    spec = storage_spec(
+        args.capacity,
+        args.power,
+        args.efficiency,
+        args.initial_soc,
+        args.grid_charging,
+    )
+
+    start = time.perf_counter()
+    result = dispatch(
+        load,
+        new_energy_supply,
+        tradition_price,
+        new_energy_price,
+        spec,
+        levels=args.levels,
+    )
+    elapsed = time.perf_counter() - start
+
+    print("场景\t无储能成本\t有储能成本\t节省\t传统电量")
+    for i, (base, cost, trad) in enumerate(
+        zip(result["baseline_cost"], result["cost"], result["trad_used"].sum(1)), 1
+    ):
+        print(f"{i}\t{base:.2f}\t{cost:.2f}\t{base - cost:.2f}\t{trad:.2f}")
+    saving = result["baseline_cost"] - result["cost"]
+    print(
+        f"平均节省：{np.mean(saving):.2f} 元，"
+        f"求解 {len(scenarios)} 个场景耗时 {elapsed * 1000:.1f} ms"
+    )
+    return 0
+
+
+def cmd_jobs(args):
+    from job_scheduler import PRIORITY_NAMES, make_jobs, schedule_jobs
+
+    tradition_price, new_energy_price, new_energy_supply, periods = load_inputs(
+        args.attachment1, args.attachment2, args.cache
+    )
+    jobs = make_jobs(periods, args.deadline, args.scale)
+
+    start = time.perf_counter()
+    result = schedule_jobs(
+        jobs, tradition_price, new_energy_price, new_energy_supply, args.capacity
+    )
+    elapsed = time.perf_counter() - start
+
+    late = jobs["priority"][result["violations"]]
+    print(f"作业数：{len(jobs['energy'])}，调度耗时：{elapsed * 1000:.1f} ms")
+    print(f"传统能源总用量：{result['trad_used'].sum():.2f} 千瓦时")
+    print(f"24小时总电力成本为：{result['cost']:.2f} 元")
+    print(
+        "超期作业数："
+        + "，".join(
+            f"{name} {int((late == level).sum())}"
+            for level, name in enumerate(PRIORITY_NAMES)
+        )
+    )
+    return 0
+
+
+def cmd_lagrangian(args):
+    import lagrangian
+
+    tradition_price, new_energy_price, new_energy_supply, periods = load_inputs(
+        args.attachment1, args.attachment2, args.cache
+    )
+    if args.jobs_scale:
+        from job_scheduler import make_jobs
+
+        instance = lagrangian.instance_from_jobs(
+            make_jobs(periods, scale=args.jobs_scale)
+        )
+    else:
+        instance = lagrangian.make_instance(periods, args.pieces)
+
+    start = time.perf_counter()
+    result = lagrangian.solve(
+        instance,
+        tradition_price,
+        new_energy_price,
+        new_energy_supply,
+        iterations=args.iterations,
+        gap=args.gap,
+    )
+    elapsed = time.perf_counter() - start
+
+    print(f"子任务数：{len(instance['energy'])}，求解耗时：{elapsed * 1000:.1f} ms")
+    print("迭代\t下界\t上界")
+    for it, lower, upper in result["history"]:
+        print(f"{it}\t{lower:.2f}\t{upper:.2f}")
+    print(
+        f"目标函数：{result['objective']:.2f}，对偶下界：{result['lower_bound']:.2f}，"
+        f"对偶间隙：{result['gap']:.4%}"
+    )
+    trad_total = (result["total_usage"] - result["green_usage"]).sum()
+    print(f"传统能源总用量：{trad_total:.2f} 千瓦时")
+    print(f"24小时总电力成本为：{result['cost']:.2f} 元")
+
+    if args.compare:
+        import problem3
+
+        start = time.perf_counter()
+        objective, _, _ = problem3.build_and_solve_model(
+            tradition_price,
+            new_energy_price,
+            new_energy_supply,
+            *problem3.split_periods(periods),
+        )
+        elapsed = time.perf_counter() - start
+        print(f"[问题3 CBC] 目标函数：{objective:.2f}，耗时：{elapsed * 1000:.1f} ms")
+    return 0
+
+
+def _scenario_inputs(args):
+    """读取单个场景（--attachment1/2、--cache）或 --data-dir 下的全部测试场景"""
+    if not args.data_dir:
+        return [load_inputs(args.attachment1, args.attachment2, args.cache)]
+    scenarios = []
+    for i in range(1, args.count + 1):
+        attachment1 = os.path.join(args.data_dir, f"附件1_测试{i}.xlsx")
+        attachment2 = os.path.join(args.data_dir, f"附件2_测试{i}.xlsx")
+        cache = os.path.join(args.cache_dir, f"测试{i}.npz") if args.cache_dir else None
+        scenarios.append(load_inputs(attachment1, attachment2, cache))
+    return scenarios
+
+
+def cmd_validate(args):
+    import validator
+
+    scenarios = _scenario_inputs(args)
+    for model in args.models:
+        cases = []
+        for tradition_price, new_energy_price, new_energy_supply, periods in scenarios:
+            if model == "1":
+                case = validator.case_from_problem1(
+                    tradition_price,
+                    new_energy_price,
+                    new_energy_supply,
+                    periods,
+                    args.capacity,
+                )
+            elif model == "2":
+                case = validator.case_from_problem2(
+                    tradition_price,
+                    new_energy_price,
+                    new_energy_supply,
+                    periods,
+                    args.capacity,
+                )
+            elif model == "3":
+                import problem3
+
+                *_, placements = problem3.build_and_solve_model(
+                    tradition_price,
+                    new_energy_price,
+                    new_energy_supply,
+                    *problem3.split_periods(periods),
+                    return_placements=True,
+                )
+                case = validator.case_from_problem3(
+                    new_energy_supply, periods, placements, args.capacity
+                )
+            else:
+                from job_scheduler import make_jobs, schedule_jobs
+
+                jobs = make_jobs(periods)
+                result = schedule_jobs(
+                    jobs,
+                    tradition_price,
+                    new_energy_price,
+                    new_energy_supply,
+                    args.capacity,
+                )
+                case = validator.case_from_jobs(
+                    new_energy_supply, jobs, result, args.capacity
+                )
+            cases.append(case)
+
+        start = time.perf_counter()
+        report = validator.validate(validator.stack_cases(cases))
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"模型{model}：{int(report['ok'].sum())}/{len(cases)} 个场景通过校验"
+            f"（校验耗时 {elapsed * 1000:.1f} ms）"
+        )
+        for i in range(len(cases)):
+            if report["ok"][i]:
+                continue
+            bad_hours = report["hour_violation"][i].nonzero()[0].tolist()
+            print(
+                f"  场景{i + 1}：违规小时 {bad_hours}，"
+                f"违规任务 {int(report['task_violation'][i].sum())} 个"
+            )
+    return 0
+
+
+def cmd_multisite(args):
+    from multisite import build_and_solve_multisite, load_sites
+
+    pairs = list(args.site or [])
+    if args.data_dir:
+        pairs += [
+            (
+                os.path.join(args.data_dir, f"附件1_测试{i}.xlsx"),
+                os.path.join(args.data_dir, f"附件2_测试{i}.xlsx"),
+            )
+            for i in range(1, args.count + 1)
+        ]
+    sites = load_sites(pairs, args.cache_dir)
+
+    runs = [("可迁移", True)]
+    if args.compare:
+        runs.append(("各站点独立", False))
+    for label, allow_transfer in runs:
+        start = time.perf_counter()
+        result = build_and_solve_multisite(
+            sites,
+            args.transfer_cost,
+            args.capacity,
+            allow_transfer,
+            threads=args.threads,
+        )
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"[{label}] 状态：{result['status']}，{len(sites)} 个站点，"
+            f"求解耗时 {elapsed * 1000:.1f} ms"
+        )
+        print("站点\t电费\t绿电\t传统电\t净迁入")
+        flow = result["flow"]
+        for s, site in enumerate(sites):
+            green = sum(result["green_usage"][s].values())
+            trad = sum(result["total_usage"][s].values()) - green
+            inflow = sum(flow[o][s] for o in range(len(sites)) if o != s)
+            outflow = sum(flow[s][o] for o in range(len(sites)) if o != s)
+            print(
+                f"{site['name']}\t{result['site_cost'][s]:.2f}\t{green:.2f}"
+                f"\t{trad:.2f}\t{inflow - outflow:.2f}"
+            )
+        print(
+            f"总成本：{result['cost']:.2f} 元（其中迁移成本 "
+            f"{result['transfer_cost']:.2f} 元）"
+        )
+    return 0
+
+
+def positive_int(text):
+    """argparse 类型：正整数"""
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"需要正整数，收到：{text}")
+    return value
+
+
+def positive_float(text):
+    """argparse 类型：正数"""
+    value = float(text)
+    if not value > 0:
+        raise argparse.ArgumentTypeError(f"需要正数，收到：{text}")
+    return value
+
+
+def efficiency(text):
+    """argparse 类型：(0, 1] 内的效率"""
+    value = float(text)
+    if not 0 < value <= 1:
+        raise argparse.ArgumentTypeError(f"效率需在 (0, 1] 内，收到：{text}")
+    return value
+
+
+def input_error(args):
+    """检查子命令的输入文件和储能参数，有问题时返回错误信息，否则返回 None"""
+    if args.command == "storage":
+        if not 0 <= args.initial_soc <= args.capacity:
+            return f"--initial-soc 需在 [0, {args.capacity:g}] 内"
+        if args.levels < 2:
+            return "--levels 至少为 2"
+    paths = []
+    if getattr(args, "results", None):
+        paths.append(args.results)
+    elif getattr(args, "data_dir", None):
+        paths += [
+            os.path.join(args.data_dir, f"附件{k}_测试{i}.xlsx")
+            for i in range(1, args.count + 1)
+            for k in (1, 2)
+        ]
+    elif hasattr(args, "attachment1"):
+        attachments = [p for p in (args.attachment1, args.attachment2) if p]
+        if len(attachments) == 1:
+            return "--attachment1 和 --attachment2 需要同时给出"
+        if not attachments and not (
+            args.cache and os.path.isfile(cache_file(args.cache))
+        ):
+            return "请给出 --attachment1 和 --attachment2，或已存在的 --cache 缓存"
+        paths += attachments
+    paths += [p for pair in getattr(args, "site", None) or [] for p in pair]
+
+    if args.command == "multisite" and not paths:
+        return "请用 --site 或 --data-dir 指定至少一个站点"
+    missing = [p for p in paths if not os.path.isfile(p)]
+    if missing:
+        return "找不到输入文件：" + "，".join(missing)
+    return None
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m cli", description="数据中心电力-算力协同调度"
+    )
+    parser.add_argument(
+        "--import-time",
+        action="store_true",
+        help="在 stderr 打印重量级依赖的导入耗时和总耗时",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (
+        ("problem1", "基础调度模型（时段任务均分）"),
+        ("problem2", "优先级经验调度模型"),
+        ("problem3", "线性规划调度模型（PuLP/CBC）"),
+    ):
+        p = sub.add_parser(name, help=help_text)
+        p.add_argument("--attachment1", help="附件1 Excel 路径（电价、新能源供应）")
+        p.add_argument("--attachment2", help="附件2 Excel 路径（时段任务数）")
+        p.add_argument(
+            "--cache",
+            help=".npz 缓存路径；由同一组附件（路径、修改时间、大小一致）生成，"
+            "或只给出 --cache 时直接读取，否则重新读取 Excel 并写入",
+        )
+        p.add_argument("--plot", action="store_true", help="绘制每小时结果图")
+        if name == "problem3":
+            p.add_argument(
+                "--storage-capacity",
+                type=positive_float,
+                help="储能容量（千瓦时），给定时加入储能变量",
+            )
+            p.add_argument(
+                "--storage-power", type=positive_float, help="最大充放电功率（千瓦）"
+            )
+            p.add_argument("--storage-efficiency", type=efficiency, default=0.9)
+            p.add_argument("--storage-grid-charging", action="store_true")
+        else:
+            p.set_defaults(storage_capacity=None)
+        p.set_defaults(func=cmd_problem)
+
+    p = sub.add_parser("gen", help="生成鲁棒性测试数据")
+    p.add_argument("--output-dir", default="鲁棒性测试数据")
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=cmd_gen)
+
+    p = sub.add_parser("report", help="在多组测试数据上对比各模型成本")
+    p.add_argument("--data-dir", default="鲁棒性测试数据")
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--models", nargs="+", choices=["1", "2", "3"], default=["1", "2"])
+    p.add_argument("--cache-dir", help="按测试编号缓存 .npz 的目录")
+    p.add_argument("--save", help="把各模型成本和传统电量保存为 .npz，供 stats 使用")
+    p.set_defaults(func=cmd_report)
+
+    p = sub.add_parser("stats", help="鲁棒性统计：分位数、配对差值、自助法置信区间")
+    p.add_argument("--results", help="report --save 保存的结果文件")
+    p.add_argument("--data-dir", default="鲁棒性测试数据")
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--models", nargs="+", choices=["1", "2", "3"], default=["1", "2"])
+    p.add_argument("--cache-dir")
+    p.add_argument(
+        "--resamples", type=positive_int, default=10000, help="自助法重抽样次数"
+    )
+    p.add_argument("--confidence", type=float, default=0.95)
+    p.add_argument("--level", type=float, default=0.95, help="CVaR 的置信水平")
+    p.add_argument("--seed", type=int, default=None)
+    p.set_defaults(func=cmd_stats)
+
+    p = sub.add_parser("jobs", help="按作业粒度的 EDF/最便宜小时调度")
+    p.add_argument("--attachment1")
+    p.add_argument("--attachment2")
+    p.add_argument("--cache")
+    p.add_argument("--deadline", type=int, default=24, help="中低任务截止期（小时）")
+    p.add_argument(
+        "--capacity", type=float, help="每小时可运行的最大能耗（千瓦时），默认不限"
+    )
+    p.add_argument("--scale", type=float, default=1, help="任务数放大倍数")
+    p.set_defaults(func=cmd_jobs)
+
+    p = sub.add_parser("lagrangian", help="问题3的拉格朗日分解求解（给出对偶间隙）")
+    p.add_argument("--attachment1")
+    p.add_argument("--attachment2")
+    p.add_argument("--cache")
+    p.add_argument(
+        "--pieces",
+        type=positive_int,
+        default=1,
+        help="每个子任务再等分的份数，用于放大规模",
+    )
+    p.add_argument(
+        "--jobs-scale",
+        type=float,
+        help="改用 job_scheduler 的逐任务作业，并按该倍数放大任务数",
+    )
+    p.add_argument(
+        "--iterations", type=positive_int, default=5000, help="次梯度迭代次数上限"
+    )
+    p.add_argument("--gap", type=float, default=1e-4, help="目标相对对偶间隙")
+    p.add_argument(
+        "--compare", action="store_true", help="同时用 CBC 求解原问题3模型对比"
+    )
+    p.set_defaults(func=cmd_lagrangian)
+
+    p = sub.add_parser("validate", help="校验各模型调度方案是否满足全部约束")
+    p.add_argument(
+        "--models",
+        nargs="+",
+        choices=["1", "2", "3", "jobs"],
+        default=["1", "2", "jobs"],
+    )
+    p.add_argument("--attachment1")
+    p.add_argument("--attachment2")
+    p.add_argument("--cache")
+    p.add_argument("--data-dir", help="批量校验该目录下的测试数据")
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--cache-dir")
+    p.add_argument(
+        "--capacity", type=float, help="每小时可运行的最大能耗（千瓦时），默认不限"
+    )
+    p.set_defaults(func=cmd_validate)
+
+    p = sub.add_parser("multisite", help="多站点调度（中低任务可跨站点迁移）")
+    p.add_argument(
+        "--site",
+        nargs=2,
+        action="append",
+        metavar=("ATTACHMENT1", "ATTACHMENT2"),
+        help="一个站点的附件1、附件2，可重复",
+    )
+    p.add_argument("--data-dir", help="把该目录下每组测试数据当作一个站点")
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--cache-dir")
+    p.add_argument(
+        "--transfer-cost", type=float, default=0.05, help="迁移成本（元/千瓦时）"
+    )
+    p.add_argument("--capacity", type=float, help="每站点每小时最大用电量（千瓦时）")
+    p.add_argument("--threads", type=int, help="CBC 线程数")
+    p.add_argument("--compare", action="store_true", help="同时求解不迁移的方案")
+    p.set_defaults(func=cmd_multisite)
+
+    p = sub.add_parser("storage", help="在模型1/2的调度结果上做储能动态规划调度")
+    p.add_argument("--model", choices=["1", "2"], default="2")
+    p.add_argument("--attachment1")
+    p.add_argument("--attachment2")
+    p.add_argument("--cache")
+    p.add_argument("--data-dir", help="批量读取该目录下的测试数据（附件1_测试i.xlsx）")
+    p.add_argument("--count", type=int, default=10)
+    p.add_argument("--cache-dir")
+    p.add_argument(
+        "--capacity", type=positive_float, required=True, help="储能容量（千瓦时）"
+    )
+    p.add_argument(
+        "--power", type=positive_float, help="最大充放电功率（千瓦），默认容量/4"
+    )
+    p.add_argument("--efficiency", type=efficiency, default=0.9, help="往返效率")
+    p.add_argument("--initial-soc", type=float, default=0.0, help="初始电量（千瓦时）")
+    p.add_argument("--grid-charging", action="store_true", help="允许用传统电力充电")
+    p.add_argument(
+        "--levels",
+        type=positive_int,
+        default=51,
+        help="SOC 离散档数（至少 2），档位之间线性插值",
+    )
+    p.set_defaults(func=cmd_storage)
+
+    return parser
+
+
+def main(argv=None):
+    start = time.perf_counter()
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    error = input_error(args)
+    if error:
+        parser.error(error)
+    if getattr(args, "cache_dir", None):
+        os.makedirs(args.cache_dir, exist_ok=True)
+    restore = record_imports() if args.import_time else None
+
+    try:
+        status = args.func(args)
+    finally:
+        if restore:
+            restore()
+
+    if args.import_time:
+        times = import_times()
+        for name, seconds in times.items():
+            print(f"import {name}: {seconds * 1000:.1f} ms", file=sys.stderr)
+        print(
+            f"导入合计：{sum(times.values()) * 1000:.1f} ms，"
+            f"总耗时：{(time.perf_counter() - start) * 1000:.1f} ms",
+            file=sys.stderr,
+        )
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
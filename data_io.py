@@ -0,0 +1,159 @@
+import os
+
+# 一天的小时数，各模型都按 24 小时循环
+HOURS = 24
+# 各紧急程度任务的单任务能耗（千瓦时）
+TASK_ENERGY = {"high": 80, "mid": 50, "low": 30}
+
+
+def hourly_array(values):
+    """按小时的 dict（缺的小时记 0）、序列或数组转为浮点数组"""
+    import numpy as np
+
+    if isinstance(values, dict):
+        values = [values.get(h, 0) for h in range(HOURS)]
+    return np.asarray(values, dtype=float)
+
+
+def load_attachment1(file_path):
+    """加载附件1数据（传统电价、新能源电价、新能源供应量）"""
+    import pandas as pd
+
+    df_tradition = pd.read_excel(file_path, sheet_name="传统电价")
+    tradition_price = df_tradition.set_index("时间（时）")[
+        "传统电价（单位：元/千瓦时 ）"
+    ].to_dict()
+
+    df_new_energy_price = pd.read_excel(file_path, sheet_name="新能源电价")
+    new_energy_price = df_new_energy_price.set_index("时间（时）")[
+        "电价（单位：元/千瓦时 ）"
+    ].to_dict()
+
+    # 新能源供应量单位转换（兆瓦->千瓦时）
+    df_supply = pd.read_excel(file_path, sheet_name="新能源电力供应量")
+    new_energy_supply = (
+        df_supply.set_index("时间（时）")["新能源电力供应（兆瓦）"] * 1000
+    ).to_dict()
+
+    return tradition_price, new_energy_price, new_energy_supply
+
+
+def load_periods(file_path):
+    """读取附件2，返回 [(开始小时, 结束小时, 高, 中, 低), ...]"""
+    import pandas as pd
+
+    df = pd.read_excel(file_path, sheet_name="Sheet1")
+    periods = []
+    for _, row in df.iterrows():
+        time_range = row.iloc[0]
+        start_str, end_str = time_range.split("-")
+        start_hour = int(start_str.split(":")[0])
+        end_hour = int(end_str.split(":")[0])
+        periods.append((start_hour, end_hour, row.iloc[1], row.iloc[2], row.iloc[3]))
+    return periods
+
+
+def source_stamp(sources):
+    """源 Excel 文件的 [绝对路径, 修改时间(ns), 大小]，记录在缓存中用于判断来源
+
+    给定的路径不存在时抛出 FileNotFoundError。
+    """
+    stamp = []
+    for src in sources:
+        if not os.path.isfile(src):
+            raise FileNotFoundError(f"找不到输入文件：{src}")
+        stat = os.stat(src)
+        stamp.append([os.path.abspath(src), str(stat.st_mtime_ns), str(stat.st_size)])
+    return stamp
+
+
+def save_cache(
+    cache_path,
+    tradition_price,
+    new_energy_price,
+    new_energy_supply,
+    periods,
+    sources=(),
+):
+    """把两个附件的数据保存为 .npz 缓存，后续运行无需 pandas 读取 Excel
+
+    sources 为生成缓存的 (附件1, 附件2) 路径，其路径、修改时间和大小一并保存。
+    """
+    import numpy as np
+
+    os.makedirs(os.path.dirname(cache_path) or ".", exist_ok=True)
+    np.savez(
+        cache_path,
+        tradition_price=hourly_array(tradition_price),
+        new_energy_price=hourly_array(new_energy_price),
+        new_energy_supply=hourly_array(new_energy_supply),
+        periods=np.array(periods, dtype=float).reshape(-1, 5),
+        sources=np.array(source_stamp(sources), dtype=str).reshape(-1, 3),
+    )
+
+
+def load_cache(cache_path):
+    """读取 .npz 缓存，返回与 Excel 读取一致的结构"""
+    import numpy as np
+
+    with np.load(cache_path) as data:
+        tradition_price = dict(enumerate(data["tradition_price"].tolist()))
+        new_energy_price = dict(enumerate(data["new_energy_price"].tolist()))
+        new_energy_supply = dict(enumerate(data["new_energy_supply"].tolist()))
+        periods = [
+            (int(start), int(end), high, mid, low)
+            for start, end, high, mid, low in data["periods"].tolist()
+        ]
+    return tradition_price, new_energy_price, new_energy_supply, periods
+
+
+def cache_file(cache_path):
+    """统一缓存文件后缀（np.savez 会自动补 .npz）"""
+    if cache_path and not cache_path.endswith(".npz"):
+        cache_path += ".npz"
+    return cache_path
+
+
+def cache_is_fresh(cache_path, sources):
+    """缓存存在、且由同一组源文件（路径、修改时间、大小都一致）生成时视为可用
+
+    sources 为 (附件1, 附件2)，都未给出时只要缓存存在即可用；
+    给出的路径不存在时抛出 FileNotFoundError。
+    """
+    import numpy as np
+
+    cache_path = cache_file(cache_path)
+    sources = [src for src in sources if src]
+    stamp = source_stamp(sources)
+    if not cache_path or not os.path.exists(cache_path):
+        return False
+    if not sources:
+        return True
+    with np.load(cache_path) as data:
+        if "sources" not in data.files:
+            return False  # 旧格式缓存没有来源信息
+        return data["sources"].tolist() == stamp
+
+
+def load_inputs(attachment1=None, attachment2=None, cache_path=None):
+    """加载附件1、附件2；给定缓存且缓存来自同一组 Excel 文件时直接读缓存"""
+    cache_path = cache_file(cache_path)
+    sources = (attachment1, attachment2)
+    if cache_path and cache_is_fresh(cache_path, sources):
+        return load_cache(cache_path)
+
+    if not attachment1 or not attachment2:
+        raise FileNotFoundError("缺少附件1/附件2路径，且没有可用的缓存文件")
+
+    tradition_price, new_energy_price, new_energy_supply = load_attachment1(attachment1)
+    periods = load_periods(attachment2)
+    if cache_path:
+        save_cache(
+            cache_path,
+            tradition_price,
+            new_energy_price,
+            new_energy_supply,
+            periods,
+            sources,
+        )
+    return tradition_price, new_energy_price, new_energy_supply, periods
@@ -0,0 +1,217 @@
+"""按任务（作业）粒度的截止期调度
+
+不再把时段任务数均分成小时内的小数子任务，而是把每个任务看作一个离散作业
+（发布时间、截止时间、能耗、优先级），按 优先级 -> 最早截止期(EDF) 的顺序
+逐个放到窗口内当前最便宜的小时。
+
+每种作业能耗各维护一棵线段树，叶子为“在该小时再放一个此能耗作业的边际电费”
+（先用剩余绿电，不足部分用传统电力），一次放置只需 O(log T) 的区间最小值
+查询和单点更新。发布时间、截止期、能耗都相同的作业可以互换，只要最便宜的
+小时边际电费不变就整批放入，因此百万级作业也只需少量树操作。
+
+时间轴与问题2/3一致按 24 小时循环：在 h 时发布、截止期 24 小时的作业可放在
+h, h+1, ..., h+23 (mod 24) 中任一小时。
+"""
+
+import numpy as np
+
+from data_io import HOURS, TASK_ENERGY, hourly_array
+
+PRIORITY_NAMES = ("high", "mid", "low")
+
+
+def make_jobs(periods, deadline_hours=HOURS, scale=1):
+    """把附件2的时段任务数展开为作业数组
+
+    每个时段内的任务按发布顺序均匀分布到时段内各小时。高紧急任务须在发布
+    的小时内完成（截止期 1 小时），中、低紧急任务截止期为 deadline_hours。
+    scale 用于放大任务数做规模测试。
+
+    返回字典：release、deadline（不含）、energy、priority 四个等长数组。
+    """
+    release, deadline, energy, priority = [], [], [], []
+    for start_hour, end_hour, *counts in periods:
+        num_hours = end_hour - start_hour
+        if num_hours <= 0:
+            continue
+        for level, count in enumerate(counts):
+            n = int(round(count * scale))
+            if n <= 0:
+                continue
+            hours = start_hour + np.arange(n) * num_hours // n
+            window = 1 if level == 0 else deadline_hours
+            release.append(hours)
+            deadline.append(hours + window)
+            energy.append(np.full(n, TASK_ENERGY[PRIORITY_NAMES[level]], dtype=float))
+            priority.append(np.full(n, level))
+
+    if not release:
+        empty = np.zeros(0, dtype=int)
+        return {
+            "release": empty,
+            "deadline": empty,
+            "energy": np.zeros(0),
+            "priority": empty,
+        }
+    return {
+        "release": np.concatenate(release),
+        "deadline": np.concatenate(deadline),
+        "energy": np.concatenate(energy),
+        "priority": np.concatenate(priority),
+    }
+
+
+class _MinTree:
+    """区间最小值线段树，查询返回 (最小值, 最左位置)"""
+
+    def __init__(self, values):
+        self.n = len(values)
+        self.size = 1
+        while self.size < self.n:
+            self.size *= 2
+        self.tree = [(np.inf, -1)] * (2 * self.size)
+        for i, value in enumerate(values):
+            self.tree[self.size + i] = (value, i)
+        for i in range(self.size - 1, 0, -1):
+            self.tree[i] = min(self.tree[2 * i], self.tree[2 * i + 1])
+
+    def update(self, pos, value):
+        i = self.size + pos
+        self.tree[i] = (value, pos)
+        i //= 2
+        while i:
+            self.tree[i] = min(self.tree[2 * i], self.tree[2 * i + 1])
+            i //= 2
+
+    def query(self, lo, hi):
+        """[lo, hi) 内的 (最小值, 位置)"""
+        best = (np.inf, -1)
+        lo += self.size
+        hi += self.size
+        while lo < hi:
+            if lo & 1:
+                best = min(best, self.tree[lo])
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                best = min(best, self.tree[hi])
+            lo //= 2
+            hi //= 2
+        return best
+
+
+def schedule_jobs(
+    jobs,
+    tradition_price,
+    new_energy_price,
+    new_energy_supply,
+    capacity=None,
+):
+    """按 优先级 -> EDF 顺序把作业放到窗口内边际电费最低的小时
+
+    capacity 为每小时可运行的最大能耗（千瓦时，标量或按小时数组），
+    None 表示不限；窗口内没有容量时该作业记为超期。
+
+    返回字典：
+        slot: 每个作业所在小时，-1 表示未能在截止期内安排
+        green / trad: 每个作业使用的绿电 / 传统电力
+        green_used / trad_used / load: 每小时绿电、传统电力和总用电量
+        cost: 总电费
+        violations: 超期作业的下标
+    """
+    tradition_price = hourly_array(tradition_price)
+    new_energy_price = hourly_array(new_energy_price)
+    remaining = hourly_array(new_energy_supply).copy()
+    n_slots = len(remaining)
+    limit = np.full(n_slots, np.inf)
+    if capacity is not None:
+        limit[:] = capacity
+    used = np.zeros(n_slots)
+
+    release = np.asarray(jobs["release"]) % n_slots
+    window = np.minimum(np.asarray(jobs["deadline"]) - jobs["release"], n_slots)
+    energy = np.asarray(jobs["energy"], dtype=float)
+    n_jobs = len(energy)
+
+    def marginal_cost(e, h):
+        if used[h] + e > limit[h] + 1e-9:
+            return np.inf
+        green = min(e, remaining[h])
+        return green * new_energy_price[h] + (e - green) * tradition_price[h]
+
+    trees = {
+        e: _MinTree([marginal_cost(e, h) for h in range(n_slots)])
+        for e in np.unique(energy).tolist()
+    }
+
+    def cheapest(tree, start, length):
+        # 循环窗口最多拆成两段，值相同时取窗口中靠前的小时
+        end = start + length
+        if end <= n_slots:
+            return tree.query(start, end)
+        first = tree.query(start, n_slots)
+        second = tree.query(0, end - n_slots)
+        return second if second[0] < first[0] else first
+
+    slot = np.full(n_jobs, -1)
+    green = np.zeros(n_jobs)
+    trad = np.zeros(n_jobs)
+
+    # 优先级 -> 截止期 -> 发布时间排序，相同作业形成连续的组
+    order = np.lexsort((energy, release, jobs["deadline"], jobs["priority"]))
+    keys = np.stack(
+        [
+            np.asarray(jobs["priority"])[order],
+            np.asarray(jobs["deadline"])[order],
+            release[order],
+            energy[order],
+        ]
+    )
+    bounds = np.flatnonzero(np.any(np.diff(keys, axis=1) != 0, axis=0)) + 1
+    bounds = np.concatenate([[0], bounds, [n_jobs]]).astype(int) if n_jobs else [0]
+
+    for a, b in zip(bounds[:-1], bounds[1:]):
+        job = order[a]
+        e = energy[job]
+        tree = trees[e]
+        pos = a
+        while pos < b:
+            value, h = cheapest(tree, release[job], window[job])
+            if value == np.inf:
+                break  # 窗口内已无容量，剩余作业超期
+
+            # 边际电费不变的范围内整批放入同一小时
+            if remaining[h] >= e:
+                count, green_part = int(remaining[h] // e), e
+            elif remaining[h] > 0:
+                count, green_part = 1, remaining[h]
+            else:
+                count, green_part = b - pos, 0.0
+            if limit[h] < np.inf:
+                count = min(count, max(int((limit[h] - used[h]) / e + 1e-9), 1))
+            count = min(count, b - pos)
+
+            placed = order[pos : pos + count]
+            slot[placed] = h
+            green[placed] = green_part
+            trad[placed] = e - green_part
+            remaining[h] = max(remaining[h] - count * green_part, 0.0)
+            used[h] += count * e
+            for other_e, other_tree in trees.items():
+                other_tree.update(h, marginal_cost(other_e, h))
+            pos += count
+
+    scheduled = slot >= 0
+    green_used = np.bincount(slot[scheduled], green[scheduled], minlength=n_slots)
+    trad_used = np.bincount(slot[scheduled], trad[scheduled], minlength=n_slots)
+    cost = float(green_used @ new_energy_price + trad_used @ tradition_price)
+    return {
+        "slot": slot,
+        "green": green,
+        "trad": trad,
+        "green_used": green_used,
+        "trad_used": trad_used,
+        "load": green_used + trad_used,
+        "cost": cost,
+        "violations": np.flatnonzero(~scheduled),
+    }
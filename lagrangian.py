@@ -0,0 +1,322 @@
+"""问题3的拉格朗日分解求解
+
+问题3中把各子任务耦合在一起的只有每小时的新能源供应约束
+    该小时绿电用量 <= 新能源供应量
+用 24 个乘子 lam[h] >= 0 把它松弛到目标函数后，绿电在 h 时的单价变为
+new_energy_price[h] - beta + lam[h]，每个子任务只需在自己的窗口内独立选出
+“绿电/传统电力中较便宜者”最低的小时。窗口相同的子任务选择相同，因此对偶函数
+只依赖按窗口汇总的能耗，一次求值是几次 (窗口数, 24) 的数组运算。
+
+    对偶：   投影次梯度法（Polyak 步长）更新乘子，给出目标函数的下界
+    原始解： 对各次迭代松弛解的小时分布取平均，按能耗类别取整分配子任务，
+             再在小时之间成批移动、两两交换子任务直到无法再降低目标，给出上界
+    对偶间隙：(上界 - 下界) / |上界|
+
+目标函数与 problem3.build_and_solve_model 一致：电费 - beta * 绿电用量。
+子任务数只影响取整和回填，百万级子任务也能在数秒内求解。
+"""
+
+import numpy as np
+
+from data_io import HOURS, TASK_ENERGY, hourly_array
+
+
+def make_instance(periods, pieces=1):
+    """由附件2时段任务构造与问题3相同的子任务
+
+    高紧急任务固定在所在小时，汇总为 high_load；中低子任务按 problem3.split_periods
+    拆分，pieces > 1 时每个子任务再等分成 pieces 份，用于构造更大规模的算例。
+
+    返回字典：high_load (24,)、energy、release、window（子任务数组）。
+    """
+    from problem3 import split_periods
+
+    if pieces < 1:
+        raise ValueError(f"pieces 至少为 1，收到：{pieces}")
+    high_tasks, mid_subtasks, low_subtasks = split_periods(periods)
+    subtasks = np.array(mid_subtasks + low_subtasks, dtype=float).reshape(-1, 2)
+    return {
+        "high_load": np.array(
+            [high_tasks.get(h, 0) * TASK_ENERGY["high"] for h in range(HOURS)]
+        ),
+        "energy": np.repeat(subtasks[:, 0] / pieces, pieces),
+        "release": np.repeat(subtasks[:, 1].astype(int), pieces),
+        "window": np.full(len(subtasks) * pieces, HOURS),
+    }
+
+
+def instance_from_jobs(jobs):
+    """由 job_scheduler.make_jobs 的作业构造算例，每个作业为一个不可拆分的子任务"""
+    release = np.asarray(jobs["release"])
+    return {
+        "high_load": np.zeros(HOURS),
+        "energy": np.asarray(jobs["energy"], dtype=float),
+        "release": release % HOURS,
+        "window": np.minimum(np.asarray(jobs["deadline"]) - release, HOURS),
+    }
+
+
+def _hour_cost(load, supply, green_price, trad_price):
+    """每小时用电量为 load 时的最低费用（绿电不超过供应量，也可全用传统电力）"""
+    green = np.minimum(load, supply)
+    return np.minimum(green_price, trad_price) * green + trad_price * (load - green)
+
+
+def _classes(instance):
+    """把子任务按 (可选小时集合, 能耗) 分组
+
+    返回 (allowed, group_of_class, class_energy, class_count, class_of_item)，
+    allowed 为 (窗口组数, 24) 的布尔矩阵。
+    """
+    window = np.minimum(instance["window"], HOURS)
+    # 窗口覆盖全天时发布时间不影响可选小时
+    release = np.where(window >= HOURS, 0, instance["release"] % HOURS)
+    keys, group = np.unique(
+        np.stack([release, window], axis=1), axis=0, return_inverse=True
+    )
+    offset = (np.arange(HOURS)[None, :] - keys[:, :1]) % HOURS
+    allowed = offset < keys[:, 1:]
+
+    classes, class_of_item, class_count = np.unique(
+        np.stack([group.ravel().astype(float), instance["energy"]], axis=1),
+        axis=0,
+        return_inverse=True,
+        return_counts=True,
+    )
+    return (
+        allowed,
+        classes[:, 0].astype(int),
+        classes[:, 1],
+        class_count,
+        class_of_item.ravel(),
+    )
+
+
+def _round_counts(fraction, count):
+    """把每类子任务数按小时比例取整（最大余数法），每行之和等于 count"""
+    target = fraction * count[:, None]
+    base = np.floor(target + 1e-9)
+    missing = (count - base.sum(axis=1)).astype(int)
+    rank = np.argsort(np.argsort(base - target, axis=1, kind="stable"), axis=1)
+    return (base + (rank < missing[:, None])).astype(int)
+
+
+def _best_swap(counts, energy, allowed, load, supply, green_price, trad_price):
+    """最优的交换：c 类一个子任务 h -> k，同时 d 类一个子任务 k -> h"""
+    c, h = np.nonzero(counts)
+    e = energy[c]
+    # 行为 (c, h)，列为 (d, k)
+    change = e[None, :] - e[:, None]  # h 小时的用电量变化 e_d - e_c
+    base = _hour_cost(load, supply, green_price, trad_price)
+    delta = (
+        _hour_cost(
+            load[h][:, None] + change,
+            supply[h][:, None],
+            green_price[h][:, None],
+            trad_price[h][:, None],
+        )
+        - base[h][:, None]
+        + _hour_cost(
+            load[h][None, :] - change,
+            supply[h][None, :],
+            green_price[h][None, :],
+            trad_price[h][None, :],
+        )
+        - base[h][None, :]
+    )
+    feasible = allowed[c][:, h] & allowed[c][:, h].T & (h[:, None] != h[None, :])
+    delta = np.where(feasible & (change != 0), delta, np.inf)
+    i, j = np.unravel_index(np.argmin(delta), delta.shape)
+    return delta[i, j], (c[i], h[i]), (c[j], h[j])
+
+
+def _improve(counts, energy, allowed, high_load, supply, green_price, trad_price):
+    """局部搜索：在小时之间成批移动子任务、交换两个子任务，直到无法降低目标
+
+    allowed 为每类子任务的 (类别数, 24) 可选小时。
+    """
+    load = high_load + counts.T @ energy
+    n_classes = len(energy)
+    rows = np.arange(n_classes)
+    for _ in range(100 * HOURS * max(n_classes, 1)):
+        base = _hour_cost(load, supply, green_price, trad_price)
+        up = load[None, :] + energy[:, None]
+        down = load[None, :] - energy[:, None]
+        add = _hour_cost(up, supply, green_price, trad_price) - base
+        remove = base - _hour_cost(down, supply, green_price, trad_price)
+        add = np.where(allowed, add, np.inf)
+        remove = np.where(counts > 0, remove, -np.inf)
+
+        # delta[c, h, k]：把 c 类一个子任务从 h 移到 k 的目标变化
+        delta = add[:, None, :] - remove[:, :, None]
+        delta[:, np.arange(HOURS), np.arange(HOURS)] = np.inf
+        best = np.argmin(delta.reshape(n_classes, -1), axis=1)
+        gain = delta.reshape(n_classes, -1)[rows, best]
+        c = int(np.argmin(gain))
+        if not gain[c] < -1e-9:
+            # 单个移动已无改进时尝试交换
+            gain, (c, h), (d, k) = _best_swap(
+                counts, energy, allowed, load, supply, green_price, trad_price
+            )
+            if not gain < -1e-9:
+                break
+            counts[c, h] -= 1
+            counts[c, k] += 1
+            counts[d, k] -= 1
+            counts[d, h] += 1
+            load[h] += energy[d] - energy[c]
+            load[k] += energy[c] - energy[d]
+            continue
+        h, k = divmod(int(best[c]), HOURS)
+
+        # 在两个小时的边际费用都不变的范围内一次移动多个
+        e = energy[c]
+        spare = supply[k] - load[k]
+        excess = load[h] - supply[h]
+        move = counts[c, h]
+        if spare >= e:
+            move = min(move, int(spare // e))
+        if excess >= e:
+            move = min(move, int(excess // e))
+        move = max(int(move), 1)
+        counts[c, h] -= move
+        counts[c, k] += move
+        load[h] -= move * e
+        load[k] += move * e
+    return counts, load
+
+
+def solve(
+    instance,
+    tradition_price,
+    new_energy_price,
+    new_energy_supply,
+    beta=0.15,
+    iterations=5000,
+    gap=1e-4,
+    repair_every=500,
+    patience=200,
+):
+    """拉格朗日分解求解问题3
+
+    instance: make_instance() / instance_from_jobs() 的结果
+    iterations: 次梯度迭代次数上限；对偶间隙不超过 gap 时提前结束，
+                为 0 时只返回初始修复解（下界为 -inf）
+    repair_every: 每隔多少次迭代用平均后的松弛解修复一次原始解
+    patience: 下界连续这么多次没有提高时步长系数减半
+
+    返回字典：
+        objective / lower_bound / gap: 目标函数上界、对偶下界和相对对偶间隙
+        cost: 电费（不含绿电奖励）
+        multipliers: (24,) 每小时供应约束的乘子
+        slot: 每个子任务所在小时
+        green_usage / total_usage: (24,) 每小时绿电用量和总用电量
+        history: 每次修复时的 (迭代次数, 下界, 上界)
+    """
+    trad_price = hourly_array(tradition_price)
+    green_price = hourly_array(new_energy_price) - beta
+    raw_green_price = hourly_array(new_energy_price)
+    supply = hourly_array(new_energy_supply)
+    high_load = np.asarray(instance["high_load"], dtype=float)
+    if len(instance["energy"]) == 0:
+        # 没有中低子任务：只有固定的高任务负荷，松弛问题就是原问题
+        objective = float(_hour_cost(high_load, supply, green_price, trad_price).sum())
+        green = np.where(green_price < trad_price, np.minimum(high_load, supply), 0.0)
+        return {
+            "objective": objective,
+            "lower_bound": objective,
+            "gap": 0.0,
+            "cost": float(green @ raw_green_price + (high_load - green) @ trad_price),
+            "multipliers": np.zeros(HOURS),
+            "slot": np.zeros(0, dtype=int),
+            "green_usage": green,
+            "total_usage": high_load,
+            "history": [(0, objective, objective)],
+        }
+    allowed, group_of_class, energy, count, class_of_item = _classes(instance)
+    group_energy = np.bincount(group_of_class, energy * count, minlength=len(allowed))
+    groups = np.arange(len(allowed))
+
+    def relax(lam):
+        """松弛问题：各窗口组选单价最低的小时，返回 (对偶值, 次梯度, 所选小时)"""
+        price = np.minimum(green_price + lam, trad_price)
+        choice = np.argmin(np.where(allowed, price[None, :], np.inf), axis=1)
+        load = high_load + np.bincount(choice, group_energy, minlength=HOURS)
+        green = np.where(green_price + lam < trad_price, load, 0.0)
+        value = price @ load - lam @ supply
+        return value, green - supply, choice
+
+    def repair(fraction):
+        counts = _round_counts(fraction[group_of_class], count)
+        counts, load = _improve(
+            counts,
+            energy,
+            allowed[group_of_class],
+            high_load,
+            supply,
+            green_price,
+            trad_price,
+        )
+        return float(_hour_cost(load, supply, green_price, trad_price).sum()), counts
+
+    # 初始原始解：各组全部放在不加乘子时最便宜的小时，再做局部搜索
+    _, _, choice = relax(np.zeros(HOURS))
+    start = np.zeros((len(allowed), HOURS))
+    start[groups, choice] = 1.0
+    upper, counts = repair(start)
+    # 初始乘子：绿电已用满的小时取 传统电价 - 绿电净价，使两者无差别
+    load = high_load + counts.T @ energy
+    lam = np.where(load >= supply, np.maximum(trad_price - green_price, 0.0), 0.0)
+
+    lower, best_lam = -np.inf, lam
+    average = np.zeros_like(start)
+    theta, stall = 2.0, 0
+    history = []
+    it = 0
+    for it in range(1, iterations + 1):
+        value, subgradient, choice = relax(lam)
+        if value > lower + 1e-9:
+            lower, best_lam, stall = value, lam, 0
+        else:
+            stall += 1
+            if stall >= patience:
+                theta, stall = theta / 2, 0
+
+        # 只平均最近 repair_every 次迭代的松弛解，越往后越接近最优乘子
+        average[groups, choice] += 1
+        if it % repair_every == 0:
+            candidate, candidate_counts = repair(average / repair_every)
+            if candidate < upper:
+                upper, counts = candidate, candidate_counts
+            average[:] = 0
+            history.append((it, lower, upper))
+
+        if upper - lower <= gap * abs(upper):
+            break
+        # 乘子为 0 且约束不紧的小时不再下降
+        direction = np.where((lam <= 0) & (subgradient < 0), 0.0, subgradient)
+        norm = direction @ direction
+        if norm <= 1e-12:
+            break
+        lam = np.maximum(lam + theta * (upper - value) / norm * direction, 0.0)
+    if not history or history[-1][0] != it:
+        history.append((it, lower, upper))
+
+    load = high_load + counts.T @ energy
+    green = np.where(green_price < trad_price, np.minimum(load, supply), 0.0)
+    # 子任务按类别排好后，各类依次按小时展开 counts
+    slot = np.empty(len(class_of_item), dtype=int)
+    slot[np.argsort(class_of_item, kind="stable")] = np.repeat(
+        np.tile(np.arange(HOURS), len(counts)), counts.ravel()
+    )
+    return {
+        "objective": upper,
+        "lower_bound": lower,
+        "gap": (upper - lower) / abs(upper) if upper else 0.0,
+        "cost": float(green @ raw_green_price + (load - green) @ trad_price),
+        "multipliers": best_lam,
+        "slot": slot,
+        "green_usage": green,
+        "total_usage": load,
+        "history": history,
+    }
@@ -0,0 +1,180 @@
+"""多站点数据中心调度（问题3的多站点扩展）
+
+每个站点有自己的电价、新能源供应（附件1）和任务（附件2）。高紧急任务固定在
+本站点、本小时运行；中、低紧急任务可在 24 小时循环窗口内任意小时运行，也可以
+付出迁移成本转到其他站点。由于窗口覆盖全天，中低任务只需按来源站点汇总成
+可迁移电量，模型是一个按站点分块的稀疏线性规划：
+
+    站点 s 的块：每小时 绿电 + 传统电 = 高任务负荷 + 迁入任务运行量，
+                 绿电 <= 新能源供应，（可选）总负荷 <= 容量
+    耦合约束：  来源站点 o 的可迁移电量全部分配到各站点 flow[o, s]，
+                 站点 s 全天运行的迁入任务量 = sum_o flow[o, s]
+
+目标与问题3一致：电费 - beta * 绿电用量，再加上跨站点迁移成本。
+变量数为 站点数 * 24 * 3 + 站点数^2，几十个站点也能在数秒内解完。
+"""
+
+import os
+
+from data_io import HOURS, TASK_ENERGY, load_inputs
+
+
+def load_sites(attachment_pairs, cache_dir=None):
+    """按 [(附件1, 附件2), ...] 读取多个站点数据"""
+    sites = []
+    for i, (attachment1, attachment2) in enumerate(attachment_pairs, 1):
+        cache = os.path.join(cache_dir, f"站点{i}.npz") if cache_dir else None
+        tradition_price, new_energy_price, new_energy_supply, periods = load_inputs(
+            attachment1, attachment2, cache
+        )
+        sites.append(
+            {
+                "name": f"站点{i}",
+                "tradition_price": tradition_price,
+                "new_energy_price": new_energy_price,
+                "new_energy_supply": new_energy_supply,
+                "periods": periods,
+            }
+        )
+    return sites
+
+
+def _transfer_matrix(transfer_cost, n_sites):
+    """迁移成本（元/千瓦时）：标量或 站点数 x 站点数 的矩阵，对角线视为0"""
+    if isinstance(transfer_cost, (int, float)):
+        return [
+            [0.0 if o == s else float(transfer_cost) for s in range(n_sites)]
+            for o in range(n_sites)
+        ]
+    return [
+        [0.0 if o == s else float(transfer_cost[o][s]) for s in range(n_sites)]
+        for o in range(n_sites)
+    ]
+
+
+def build_and_solve_multisite(
+    sites,
+    transfer_cost=0.05,
+    capacity=None,
+    allow_transfer=True,
+    beta=0.15,
+    time_limit=60,
+    threads=None,
+):
+    """构建并求解多站点线性规划
+
+    sites: load_sites() 的结果
+    transfer_cost: 跨站点迁移成本（元/千瓦时），标量或矩阵
+    capacity: 每站点每小时最大用电量（千瓦时），None 表示不限
+    allow_transfer: False 时各站点独立调度，用于对比
+    threads: 传给 CBC 的线程数
+
+    返回字典：
+        objective: 目标函数值（含绿电奖励）
+        cost: 电费 + 迁移成本
+        transfer_cost: 迁移成本合计
+        flow: flow[o][s] 为站点 o 迁到站点 s 的任务电量（千瓦时）
+        green_usage / total_usage: 每站点 {小时: 用电量}
+        site_cost: 每站点电费
+    """
+    import pulp as pl
+
+    from problem3 import split_periods
+
+    n_sites = len(sites)
+    transfer = _transfer_matrix(transfer_cost, n_sites)
+    model = pl.LpProblem("Multi_Site_Power_Scheduling", pl.LpMinimize)
+
+    high_load, movable = [], []
+    for site in sites:
+        high_tasks, mid_subtasks, low_subtasks = split_periods(site["periods"])
+        high_load.append(
+            [high_tasks.get(h, 0) * TASK_ENERGY["high"] for h in range(HOURS)]
+        )
+        movable.append(
+            sum(e for e, _ in mid_subtasks) + sum(e for e, _ in low_subtasks)
+        )
+
+    green = [
+        {h: pl.LpVariable(f"green_{s}_{h}", 0) for h in range(HOURS)}
+        for s in range(n_sites)
+    ]
+    trad = [
+        {h: pl.LpVariable(f"trad_{s}_{h}", 0) for h in range(HOURS)}
+        for s in range(n_sites)
+    ]
+    run = [
+        {h: pl.LpVariable(f"run_{s}_{h}", 0) for h in range(HOURS)}
+        for s in range(n_sites)
+    ]
+    flow = [
+        {
+            s: pl.LpVariable(f"flow_{o}_{s}", 0)
+            for s in range(n_sites)
+            if allow_transfer or s == o
+        }
+        for o in range(n_sites)
+    ]
+
+    # 各站点的块约束
+    for s, site in enumerate(sites):
+        supply = site["new_energy_supply"]
+        for h in range(HOURS):
+            model += green[s][h] + trad[s][h] == high_load[s][h] + run[s][h]
+            model += green[s][h] <= supply.get(h, 0)
+            if capacity is not None:
+                model += high_load[s][h] + run[s][h] <= capacity
+        model += pl.lpSum(run[s].values()) == pl.lpSum(
+            flow[o][s] for o in range(n_sites) if s in flow[o]
+        )
+
+    # 耦合约束：来源站点的中低任务全部分配出去
+    for o in range(n_sites):
+        model += pl.lpSum(flow[o].values()) == movable[o]
+
+    energy_cost = pl.lpSum(
+        green[s][h] * site["new_energy_price"][h]
+        + trad[s][h] * site["tradition_price"][h]
+        for s, site in enumerate(sites)
+        for h in range(HOURS)
+    )
+    moving_cost = pl.lpSum(
+        transfer[o][s] * var for o in range(n_sites) for s, var in flow[o].items()
+    )
+    green_total = pl.lpSum(green[s][h] for s in range(n_sites) for h in range(HOURS))
+    model += energy_cost + moving_cost - beta * green_total
+
+    model.solve(pl.PULP_CBC_CMD(msg=False, timeLimit=time_limit, threads=threads))
+
+    green_usage = [
+        {h: pl.value(green[s][h]) for h in range(HOURS)} for s in range(n_sites)
+    ]
+    total_usage = [
+        {h: pl.value(green[s][h]) + pl.value(trad[s][h]) for h in range(HOURS)}
+        for s in range(n_sites)
+    ]
+    site_cost = [
+        sum(
+            pl.value(green[s][h]) * site["new_energy_price"][h]
+            + pl.value(trad[s][h]) * site["tradition_price"][h]
+            for h in range(HOURS)
+        )
+        for s, site in enumerate(sites)
+    ]
+    flows = [
+        [pl.value(flow[o][s]) if s in flow[o] else 0.0 for s in range(n_sites)]
+        for o in range(n_sites)
+    ]
+    moved = sum(
+        transfer[o][s] * flows[o][s] for o in range(n_sites) for s in range(n_sites)
+    )
+    return {
+        "status": pl.LpStatus[model.status],
+        "objective": pl.value(model.objective),
+        "cost": sum(site_cost) + moved,
+        "transfer_cost": moved,
+        "flow": flows,
+        "green_usage": green_usage,
+        "total_usage": total_usage,
+        "site_cost": site_cost,
+    }
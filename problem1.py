@@ -1,48 +1,26 @@
-import pandas as pd
-import matplotlib.pyplot as plt
+from data_io import load_attachment1, load_periods
 
-# 设置中文显示
-plt.rcParams["font.sans-serif"] = ["SimHei"]
-plt.rcParams["axes.unicode_minus"] = False
 
+def setup_plot():
+    """按需导入 matplotlib 并设置中文显示"""
+    import matplotlib.pyplot as plt
 
-# 读取附件1数据
-def load_attachment1(file_path):
-    # 读取传统电价
-    df_tradition = pd.read_excel(file_path, sheet_name="传统电价")
-    tradition_price = df_tradition.set_index("时间（时）")[
-        "传统电价（单位：元/千瓦时 ）"
-    ].to_dict()
-    print(tradition_price)
-
-    # 读取新能源电价
-    df_new_energy_price = pd.read_excel(file_path, sheet_name="新能源电价")
-    new_energy_price = df_new_energy_price.set_index("时间（时）")[
-        "电价（单位：元/千瓦时 ）"
-    ].to_dict()
-
-    # 读取新能源供应量并转换单位（兆瓦->千瓦时）
-    df_supply = pd.read_excel(file_path, sheet_name="新能源电力供应量")
-    new_energy_supply = (
-        df_supply.set_index("时间（时）")["新能源电力供应（兆瓦）"] * 1000
-    ).to_dict()
-
-    return tradition_price, new_energy_price, new_energy_supply
+    plt.rcParams["font.sans-serif"] = ["SimHei"]
+    plt.rcParams["axes.unicode_minus"] = False
+    return plt
 
 
 # 读取附件2数据并生成小时任务分配
 def load_attachment2(file_path):
-    df = pd.read_excel(file_path, sheet_name="Sheet1")
-    hours_tasks = {hour: {"high": 0.0, "mid": 0.0, "low": 0.0} for hour in range(24)}
+    return split_periods(load_periods(file_path))
 
-    for _, row in df.iterrows():
-        time_range = row.iloc[0]
-        tasks = {"high": row.iloc[1], "mid": row.iloc[2], "low": row.iloc[3]}
 
-        # 解析时间段
-        start_str, end_str = time_range.split("-")
-        start_hour = int(start_str.split(":")[0])
-        end_hour = int(end_str.split(":")[0])
+# 把每个时段的任务平均分到时段内的每个小时
+def split_periods(periods):
+    hours_tasks = {hour: {"high": 0.0, "mid": 0.0, "low": 0.0} for hour in range(24)}
+
+    for start_hour, end_hour, high, mid, low in periods:
+        tasks = {"high": high, "mid": mid, "low": low}
         hours = list(range(start_hour, end_hour))
         num_hours = len(hours)
 
@@ -101,15 +79,9 @@ def calculate_cost(
     return total_cost, hourly_usage_rates, traditional_usage  # 修改返回值
 
 
-# 主程序
-if __name__ == "__main__":
-    # 加载数据
-    trad_price, ne_price, ne_supply = load_attachment1("附件1_测试5.xlsx")
-    task_distribution = load_attachment2("附件2_测试5.xlsx")
-
-    total, usage_rates, traditional_usage = calculate_cost(
-        trad_price, ne_price, ne_supply, task_distribution
-    )
+def plot_results(usage_rates, traditional_usage):
+    """绘制每小时传统能源使用量和绿色能源使用率"""
+    plt = setup_plot()
 
     plt.figure(figsize=(12, 6))
     plt.bar(range(24), traditional_usage, color="#1f77b4", alpha=0.7)
@@ -137,8 +109,12 @@ if __name__ == "__main__":
 
     plt.tight_layout()
     plt.show()
-    # 计算平均利用率
-    average_usage = sum(usage_rates) / len(usage_rates)
-    print(f"绿色能源平均利用率：{average_usage:.2f}%")
-    # 输出结果
-    print(f"24小时总电力成本为：{total:.2f} 元")
+
+
+# 主程序
+if __name__ == "__main__":
+    import sys
+
+    from cli import main
+
+    sys.exit(main(["problem1", *sys.argv[1:]]))
@@ -1,48 +1,29 @@
-import pandas as pd
 from collections import defaultdict
-import matplotlib.pyplot as plt
 
-# 设置中文显示
-plt.rcParams["font.sans-serif"] = ["SimHei"]
-plt.rcParams["axes.unicode_minus"] = False
+from data_io import load_attachment1, load_periods
 
 
-def load_attachment1(file_path):
-    """加载附件1数据"""
-    df_tradition = pd.read_excel(file_path, sheet_name="传统电价")
-    tradition_price = df_tradition.set_index("时间（时）")[
-        "传统电价（单位：元/千瓦时 ）"
-    ].to_dict()
+def setup_plot():
+    """按需导入 matplotlib 并设置中文显示"""
+    import matplotlib.pyplot as plt
 
-    df_new_energy_price = pd.read_excel(file_path, sheet_name="新能源电价")
-    new_energy_price = df_new_energy_price.set_index("时间（时）")[
-        "电价（单位：元/千瓦时 ）"
-    ].to_dict()
-
-    df_supply = pd.read_excel(file_path, sheet_name="新能源电力供应量")
-    new_energy_supply = (
-        df_supply.set_index("时间（时）")["新能源电力供应（兆瓦）"] * 1000
-    ).to_dict()
-
-    return tradition_price, new_energy_price, new_energy_supply
+    plt.rcParams["font.sans-serif"] = ["SimHei"]
+    plt.rcParams["axes.unicode_minus"] = False
+    return plt
 
 
 def load_attachment2(file_path):
     """加载附件2数据并生成任务分配结构"""
-    df = pd.read_excel(file_path, sheet_name="Sheet1")
+    return split_periods(load_periods(file_path))
+
+
+def split_periods(periods):
+    """把附件2的时段任务拆成高任务小时量和中低任务 (任务量, 发布时间)"""
     high_tasks = defaultdict(float)  # {小时: 任务量}
     mid_tasks = []  # (任务量, 发布时间)
     low_tasks = []
 
-    for _, row in df.iterrows():
-        time_range = row.iloc[0]
-        high = row.iloc[1]
-        mid = row.iloc[2]
-        low = row.iloc[3]
-
-        start_str, end_str = time_range.split("-")
-        start_hour = int(start_str.split(":")[0])
-        end_hour = int(end_str.split(":")[0])
+    for start_hour, end_hour, high, mid, low in periods:
         hours = list(range(start_hour, end_hour))
         num_hours = len(hours)
 
@@ -64,7 +45,7 @@ def load_attachment2(file_path):
     return high_tasks, mid_tasks, low_tasks
 
 
-def calculate_cost(
+def schedule_tasks(
     tradition_price,
     new_energy_price,
     new_energy_supply,
@@ -72,10 +53,12 @@ def calculate_cost(
     mid_tasks,
     low_tasks,
 ):
-    """新型调度策略的成本计算"""
+    """按经验策略把高、中、低任务分配到各小时
+
+    返回各阶段每小时的绿电/传统电用量，以及每个中、低任务的放置位置。
+    """
     # 初始化数据结构
     remaining_green = defaultdict(float)
-    cost = 0.0
 
     # 第一阶段：处理高优先级任务
     high_consumption = defaultdict(float)
@@ -91,12 +74,11 @@ def calculate_cost(
         # 记录消耗和剩余
         high_consumption[hour] = (green_used, trad_used)
         remaining_green[hour] = green_available - green_used
-        cost += green_used * new_energy_price[hour]
-        cost += trad_used * tradition_price[hour]
 
     # 第二阶段：处理中优先级任务
     mid_green_usage = defaultdict(float)
     mid_trad_usage = defaultdict(float)
+    mid_placements = []  # 每个中任务的 (小时, 绿电, 传统电)
     for task in mid_tasks:
         task_energy = task[0] * 50
         publish_hour = task[1]
@@ -115,6 +97,7 @@ def calculate_cost(
             if remaining_green[h] >= task_energy:
                 mid_green_usage[h] += task_energy
                 remaining_green[h] -= task_energy
+                mid_placements.append((h, task_energy, 0.0))
                 allocated = True
                 break
 
@@ -123,12 +106,14 @@ def calculate_cost(
             sorted_trad = sorted(allowed_hours, key=lambda h: tradition_price[h])
             for h in sorted_trad:
                 mid_trad_usage[h] += task_energy
+                mid_placements.append((h, 0.0, task_energy))
                 allocated = True
                 break
 
     # 第三阶段：处理低优先级任务
     low_green_usage = defaultdict(float)
     low_trad_usage = defaultdict(float)
+    low_placements = []
     for task in low_tasks:
         task_energy = task[0] * 30
         publish_hour = task[1]
@@ -144,6 +129,7 @@ def calculate_cost(
             if remaining_green[h] >= task_energy:
                 low_green_usage[h] += task_energy
                 remaining_green[h] -= task_energy
+                low_placements.append((h, task_energy, 0.0))
                 allocated = True
                 break
 
@@ -152,17 +138,57 @@ def calculate_cost(
             sorted_trad = sorted(allowed_hours, key=lambda h: tradition_price[h])
             for h in sorted_trad:
                 low_trad_usage[h] += task_energy
+                low_placements.append((h, 0.0, task_energy))
                 allocated = True
                 break
 
+    return (
+        high_consumption,
+        mid_green_usage,
+        mid_trad_usage,
+        low_green_usage,
+        low_trad_usage,
+        mid_placements,
+        low_placements,
+    )
+
+
+def calculate_cost(
+    tradition_price,
+    new_energy_price,
+    new_energy_supply,
+    high_tasks,
+    mid_tasks,
+    low_tasks,
+):
+    """新型调度策略的成本计算"""
+    (
+        high_consumption,
+        mid_green_usage,
+        mid_trad_usage,
+        low_green_usage,
+        low_trad_usage,
+        _,
+        _,
+    ) = schedule_tasks(
+        tradition_price,
+        new_energy_price,
+        new_energy_supply,
+        high_tasks,
+        mid_tasks,
+        low_tasks,
+    )
+    cost = 0.0
+
     # 计算总成本
     for hour in range(24):
         # 新能源部分
-        green_used = mid_green_usage[hour] + low_green_usage[hour]
+        high_green, high_trad = high_consumption[hour]
+        green_used = high_green + mid_green_usage[hour] + low_green_usage[hour]
         cost += green_used * new_energy_price[hour]
 
         # 传统能源部分
-        trad_used = mid_trad_usage[hour] + low_trad_usage[hour]
+        trad_used = high_trad + mid_trad_usage[hour] + low_trad_usage[hour]
         cost += trad_used * tradition_price[hour]
 
     # 计算绿色能源使用率
@@ -198,19 +224,10 @@ def calculate_cost(
     return cost, green_usage, trad_usage  # 返回新增的传统能源使用量
 
 
-if __name__ == "__main__":
-    # 加载数据
-    trad_price, ne_price, ne_supply = load_attachment1("附件1_测试5.xlsx")
-    high_tasks, mid_tasks, low_tasks = load_attachment2("附件2_测试5.xlsx")
-
-    # 计算成本和绿色能源使用率
-    total_cost, green_usage, trad_usage = calculate_cost(
-        trad_price, ne_price, ne_supply, high_tasks, mid_tasks, low_tasks
-    )
-
-    # 绘制折线图
+def plot_results(usage_rates, trad_usage):
+    """绘制每小时绿色能源使用率折线图和传统能源使用量柱状图"""
+    plt = setup_plot()
     hours = list(range(24))
-    usage_rates = [green_usage[h] for h in hours]
 
     plt.figure(figsize=(12, 6))
     plt.plot(hours, usage_rates, marker="o", linestyle="-", color="#2ca02c")
@@ -222,9 +239,6 @@ if __name__ == "__main__":
     plt.tight_layout()
     # 显示图表
     plt.show()
-    # 计算平均利用率
-    average_usage = sum(usage_rates) / len(usage_rates)
-    print(f"绿色能源平均利用率：{average_usage:.2f}%")
     plt.figure(figsize=(12, 6))
     plt.bar(
         hours,
@@ -241,8 +255,11 @@ if __name__ == "__main__":
     plt.grid(True, axis="y", linestyle="--", alpha=0.7)
     plt.tight_layout()
     plt.show()
-    # 计算平均利用率
-    average_usage = sum(usage_rates) / len(usage_rates)
-    print(f"绿色能源平均利用率：{average_usage:.2f}%")
-    # 打印总成本（保持原有输出）
-    print(f"\n优化后的24小时总电力成本为：{total_cost:.2f}元")
+
+
+if __name__ == "__main__":
+    import sys
+
+    from cli import main
+
+    sys.exit(main(["problem2", *sys.argv[1:]]))
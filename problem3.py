@@ -1,50 +1,29 @@
-import pandas as pd
-import pulp as pl
 from collections import defaultdict
-import matplotlib.pyplot as plt
 
-# 设置中文显示
-plt.rcParams["font.sans-serif"] = ["SimHei"]
-plt.rcParams["axes.unicode_minus"] = False
+from data_io import load_attachment1, load_periods
 
 
-def load_attachment1(file_path):
-    """加载附件1数据"""
-    df_tradition = pd.read_excel(file_path, sheet_name="传统电价")
-    tradition_price = df_tradition.set_index("时间（时）")[
-        "传统电价（单位：元/千瓦时 ）"
-    ].to_dict()
+def setup_plot():
+    """按需导入 matplotlib 并设置中文显示"""
+    import matplotlib.pyplot as plt
 
-    df_new_energy = pd.read_excel(file_path, sheet_name="新能源电价")
-    new_energy_price = df_new_energy.set_index("时间（时）")[
-        "电价（单位：元/千瓦时 ）"
-    ].to_dict()
-
-    df_supply = pd.read_excel(file_path, sheet_name="新能源电力供应量")
-    new_energy_supply = (
-        df_supply.set_index("时间（时）")["新能源电力供应（兆瓦）"] * 1000
-    ).to_dict()
-
-    return tradition_price, new_energy_price, new_energy_supply
+    plt.rcParams["font.sans-serif"] = ["SimHei"]
+    plt.rcParams["axes.unicode_minus"] = False
+    return plt
 
 
 def load_attachment2(file_path):
     """加载附件2数据并生成任务结构"""
-    df = pd.read_excel(file_path, sheet_name="Sheet1")
+    return split_periods(load_periods(file_path))
+
 
+def split_periods(periods):
+    """把附件2的时段任务拆成高任务小时量和中低子任务 (能耗, 发布时间)"""
     high_tasks = defaultdict(float)
     mid_subtasks = []
     low_subtasks = []
 
-    for _, row in df.iterrows():
-        time_range = row.iloc[0]
-        high = row.iloc[1]
-        mid = row.iloc[2]
-        low = row.iloc[3]
-
-        start_str, end_str = time_range.split("-")
-        start_hour = int(start_str.split(":")[0])
-        end_hour = int(end_str.split(":")[0])
+    for start_hour, end_hour, high, mid, low in periods:
         hours = list(range(start_hour, end_hour))
         num_hours = len(hours)
 
@@ -71,8 +50,24 @@ def build_and_solve_model(
     high_tasks: defaultdict,
     mid_subtasks,
     low_subtasks,
+    storage=None,
+    return_placements=False,
+    return_storage=False,
 ):
-    """构建并求解ILP模型"""
+    """构建并求解ILP模型
+
+    返回的 green_usage / total_usage 为任务从电网取用的绿电 / 总电量，
+    储能放电供给任务的部分和储能充电量都不计入。
+
+    storage 为 storage.storage_spec() 给出的储能参数，给定时加入储能变量：
+    储能可吸收剩余绿电（允许时也可用传统电力充电），放电替代传统电力。
+    return_placements 为 True 时额外返回每个子任务在各小时的绿电/传统电用量，
+    供 validator 校验。
+    return_storage 为 True 时最后再返回储能每小时的充放电量：
+    {"charge_green", "charge_trad", "discharge": [24], "soc": [25]}。
+    """
+    import pulp as pl
+
     model = pl.LpProblem("Power_Scheduling_Optimization", pl.LpMinimize)
     hours = range(24)
     beta = 0.15  # 绿色能源使用奖励系数
@@ -91,6 +86,7 @@ def build_and_solve_model(
     mid_trad_vars = defaultdict(list)
     low_green_vars = defaultdict(list)
     low_trad_vars = defaultdict(list)
+    subtask_vars = {"mid": [], "low": []}  # 每个子任务的 (g_vars, t_vars)
 
     # 处理中优先级任务
     for idx, (energy, pub_hour) in enumerate(mid_subtasks):
@@ -114,6 +110,7 @@ def build_and_solve_model(
             model += -gamma * new_energy_supply[h] * y_var  # 供应量奖励
 
         model += pl.lpSum(y_vars.values()) == 1
+        subtask_vars["mid"].append((g_vars, t_vars))
 
     # 处理低优先级任务
     for idx, (energy, pub_hour) in enumerate(low_subtasks):
@@ -137,13 +134,44 @@ def build_and_solve_model(
             model += -gamma * new_energy_supply[h] * y_var  # 供应量奖励
 
         model += pl.lpSum(y_vars.values()) == 1
+        subtask_vars["low"].append((g_vars, t_vars))
+
+    # 储能变量（未配置储能时均为0）
+    charge_green = {h: 0 for h in hours}
+    charge_trad = {h: 0 for h in hours}
+    discharge = {h: 0 for h in hours}
+    if storage is not None:
+        eta = storage["efficiency"] ** 0.5  # 充、放电效率
+        power = storage["power"]
+        soc = {h: pl.LpVariable(f"soc_{h}", 0, storage["capacity"]) for h in range(25)}
+        charge_green = {h: pl.LpVariable(f"charge_green_{h}", 0, power) for h in hours}
+        if storage["grid_charging"]:
+            charge_trad = {
+                h: pl.LpVariable(f"charge_trad_{h}", 0, power) for h in hours
+            }
+        discharge = {h: pl.LpVariable(f"discharge_{h}", 0, power) for h in hours}
+
+        model += soc[0] == storage["initial_soc"]
+        model += soc[24] >= storage["initial_soc"]
+        for h in hours:
+            model += charge_green[h] + charge_trad[h] <= power
+            model += (
+                soc[h + 1]
+                == soc[h]
+                + eta * (charge_green[h] + charge_trad[h])
+                - discharge[h] / eta
+            )
+            # 放电只替代该小时的传统电力
+            model += discharge[h] <= (
+                trad_high[h] + pl.lpSum(mid_trad_vars[h]) + pl.lpSum(low_trad_vars[h])
+            )
 
     # 新能源供应约束
     for h in hours:
         total_green = (
             green_high[h] + pl.lpSum(mid_green_vars[h]) + pl.lpSum(low_green_vars[h])
         )
-        model += total_green <= new_energy_supply[h]
+        model += total_green + charge_green[h] <= new_energy_supply[h]
 
     # 构建目标函数
     original_cost = pl.lpSum(
@@ -153,6 +181,8 @@ def build_and_solve_model(
         + [t * tradition_price[h] for h in hours for t in mid_trad_vars[h]]
         + [g * new_energy_price[h] for h in hours for g in low_green_vars[h]]
         + [t * tradition_price[h] for h in hours for t in low_trad_vars[h]]
+        + [charge_green[h] * new_energy_price[h] for h in hours]
+        + [(charge_trad[h] - discharge[h]) * tradition_price[h] for h in hours]
     )
 
     green_total = (
@@ -178,11 +208,11 @@ def build_and_solve_model(
         low_green = sum(pl.value(g) for g in low_green_vars[h])
         green_total = gh + mid_green + low_green
 
-        # 传统能源使用量
+        # 传统能源使用量（扣除储能放电替代的部分）
         trad_high_val = pl.value(trad_high[h])
         mid_trad = sum(pl.value(t) for t in mid_trad_vars[h])
         low_trad = sum(pl.value(t) for t in low_trad_vars[h])
-        trad_total = trad_high_val + mid_trad + low_trad
+        trad_total = trad_high_val + mid_trad + low_trad - pl.value(discharge[h])
 
         # 总用电量
         total = green_total + trad_total
@@ -190,24 +220,35 @@ def build_and_solve_model(
         green_usage[h] = green_total
         total_usage[h] = total
 
-    return pl.value(model.objective), green_usage, total_usage
-
-
-if __name__ == "__main__":
-    trad_price, ne_price, ne_supply = load_attachment1("附件1_测试3.xlsx")
-    high_tasks, mid_subtasks, low_subtasks = load_attachment2("附件2_测试3.xlsx")
-    total_cost, green_usage, total_usage = build_and_solve_model(
-        trad_price, ne_price, ne_supply, high_tasks, mid_subtasks, low_subtasks
-    )
-    print(f"优化后的总成本为：{total_cost:.2f}元")
-    # 计算每小时绿色能源使用率
+    result = (pl.value(model.objective), green_usage, total_usage)
+    if return_placements:
+        placements = {
+            "high": [(pl.value(green_high[h]), pl.value(trad_high[h])) for h in hours]
+        }
+        for kind, tasks in subtask_vars.items():
+            placements[kind] = [
+                {h: (pl.value(g_vars[h]), pl.value(t_vars[h])) for h in g_vars}
+                for g_vars, t_vars in tasks
+            ]
+        result += (placements,)
+    if return_storage:
+        flows = {
+            name: [pl.value(var[h]) or 0.0 for h in hours]
+            for name, var in (
+                ("charge_green", charge_green),
+                ("charge_trad", charge_trad),
+                ("discharge", discharge),
+            )
+        }
+        flows["soc"] = [pl.value(soc[h]) for h in range(25)] if storage else [0.0] * 25
+        result += (flows,)
+    return result
+
+
+def plot_results(usage_rates, trad_usage):
+    """绘制每小时绿色能源使用率折线图和传统能源使用量柱状图并保存图片"""
+    plt = setup_plot()
     hours = list(range(24))
-    usage_rates = [
-        (green_usage[h] / total_usage[h] * 100) if total_usage[h] > 0 else 0
-        for h in hours
-    ]
-    trad_usage = {h: total_usage[h] - green_usage[h] for h in hours}
-    # 生成折线图
 
     plt.figure(figsize=(12, 6))
     plt.plot(hours, usage_rates, marker="o", linestyle="-", color="#2ca02c")
@@ -223,7 +264,7 @@ if __name__ == "__main__":
     plt.figure(figsize=(12, 6))
     plt.bar(
         hours,
-        trad_usage.values(),
+        [trad_usage[h] for h in hours],
         color="#ff7f0e",
         edgecolor="black",
         alpha=0.8,
@@ -238,6 +279,11 @@ if __name__ == "__main__":
     plt.tight_layout()
     plt.savefig("traditional_energy_consumption.png")  # 保存图片
     plt.show()
-    # 计算平均利用率
-    average_usage = sum(usage_rates) / len(usage_rates)
-    print(f"绿色能源平均利用率：{average_usage:.2f}%")
+
+
+if __name__ == "__main__":
+    import sys
+
+    from cli import main
+
+    sys.exit(main(["problem3", *sys.argv[1:]]))
@@ -2,10 +2,10 @@ import pandas as pd
 import numpy as np
 import os
 
-os.makedirs("鲁棒性测试数据", exist_ok=True)
+OUTPUT_DIR = "鲁棒性测试数据"
 
 
-def process_attachment1():
+def process_attachment1(output_dir=OUTPUT_DIR, count=10):
     # 完整示例数据结构
     trad_price = {
         "时间（时）": list(range(24)),
@@ -97,7 +97,7 @@ def process_attachment1():
         ],
     }
 
-    for i in range(1, 11):
+    for i in range(1, count + 1):
         # 创建所有副本
         df_trad = pd.DataFrame(trad_price)
         df_price = pd.DataFrame(new_energy_price)
@@ -126,13 +126,13 @@ def process_attachment1():
             df_supply.at[idx, "新能源电力供应（兆瓦）"] = round(new_val, 1)
 
         # 保存文件（包含三个sheet）
-        with pd.ExcelWriter(f"鲁棒性测试数据/附件1_测试{i}.xlsx") as writer:
+        with pd.ExcelWriter(os.path.join(output_dir, f"附件1_测试{i}.xlsx")) as writer:
             df_trad.to_excel(writer, sheet_name="传统电价", index=False)
             df_price.to_excel(writer, sheet_name="新能源电价", index=False)
             df_supply.to_excel(writer, sheet_name="新能源电力供应量", index=False)
 
 
-def process_attachment2():
+def process_attachment2(output_dir=OUTPUT_DIR, count=10):
     tasks = {
         "时间": [
             "00:00-06:00",
@@ -148,7 +148,7 @@ def process_attachment2():
         "低紧急任务数": [60, 70, 0, 0, 0, 40, 15],
     }
 
-    for i in range(1, 11):
+    for i in range(1, count + 1):
         df = pd.DataFrame(tasks)
 
         # 生成缩放因子
@@ -160,10 +160,19 @@ def process_attachment2():
             df[col] = df[col].apply(lambda x: max(0, x))
 
         # 保存文件
-        df.to_excel(f"鲁棒性测试数据/附件2_测试{i}.xlsx", index=False)
+        df.to_excel(os.path.join(output_dir, f"附件2_测试{i}.xlsx"), index=False)
 
 
-# 执行生成
-process_attachment1()
-process_attachment2()
-print("数据生成完成，请查看'鲁棒性测试数据'目录")
+def generate(output_dir=OUTPUT_DIR, count=10, seed=None):
+    """生成 count 组鲁棒性测试数据"""
+    if seed is not None:
+        np.random.seed(seed)
+    os.makedirs(output_dir, exist_ok=True)
+    process_attachment1(output_dir, count)
+    process_attachment2(output_dir, count)
+
+
+if __name__ == "__main__":
+    # 执行生成
+    generate()
+    print("数据生成完成，请查看'鲁棒性测试数据'目录")
@@ -0,0 +1,155 @@
+"""鲁棒性统计分析
+
+输入为各模型在 N 个测试场景上的结果矩阵（模型数 M x 场景数 N），例如成本、
+传统电力用量。所有统计量都沿最后一维向量化计算：
+
+    summarize():          均值、标准差、变异系数、分位数
+    tail_risk():          VaR / CVaR（最差 1 - level 比例场景的平均值）
+    bootstrap_samples():  自助法重抽样，均值用下标计数 + 一次矩阵乘法
+    bootstrap_ci():       自助法百分位置信区间
+    paired_differences(): 模型两两配对差值的统计和置信区间
+
+重抽样按块进行，每块元素数不超过 max_elements，10^5 个场景也不会占满内存。
+"""
+
+import numpy as np
+
+
+def _as_matrix(values):
+    """统一为 (模型数, 场景数) 的浮点数组"""
+    return np.atleast_2d(np.asarray(values, dtype=float))
+
+
+def tail_risk(values, level=0.95):
+    """沿最后一维计算 (VaR, CVaR)：最差 1 - level 比例场景的下界和平均值"""
+    values = np.sort(np.asarray(values, dtype=float), axis=-1)
+    n = values.shape[-1]
+    start = min(int(np.floor(level * n)), n - 1)
+    tail = values[..., start:]
+    return tail[..., 0], tail.mean(axis=-1)
+
+
+STATISTICS = {
+    "mean": lambda values: values.mean(axis=-1),
+    "std": lambda values: values.std(axis=-1, ddof=1),
+    "median": lambda values: np.median(values, axis=-1),
+    "cvar": lambda values: tail_risk(values)[1],
+}
+
+
+def summarize(values, percentiles=(5, 25, 50, 75, 95), level=0.95):
+    """各模型的描述统计，返回字典，每项第一维为模型"""
+    values = _as_matrix(values)
+    mean = values.mean(axis=1)
+    std = values.std(axis=1, ddof=1) if values.shape[1] > 1 else np.zeros(len(mean))
+    var, cvar = tail_risk(values, level)
+    return {
+        "mean": mean,
+        "std": std,
+        "cv": np.divide(std, mean, out=np.zeros_like(std), where=mean != 0),
+        "min": values.min(axis=1),
+        "max": values.max(axis=1),
+        "percentiles": np.percentile(values, percentiles, axis=1).T,
+        "var": var,
+        "cvar": cvar,
+    }
+
+
+def bootstrap_samples(
+    values,
+    statistic="mean",
+    n_resamples=10000,
+    seed=None,
+    max_elements=1_000_000,
+):
+    """自助法重抽样得到的统计量，返回 (模型数, n_resamples) 数组
+
+    所有模型共用同一组重抽样，因此结果之间可以直接比较、相减。
+    statistic 为 STATISTICS 中的名称或沿最后一维计算的函数。均值不做取数，
+    而是把每次重抽样的下标计数成 (重抽样数, N) 的权重矩阵，与结果矩阵做一次
+    浮点矩阵乘法；需要多个指标时应把它们堆叠后一起抽样。
+    """
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples 至少为 1，收到：{n_resamples}")
+    values = _as_matrix(values)
+    func = STATISTICS[statistic] if isinstance(statistic, str) else statistic
+    n_models, n = values.shape
+    rng = np.random.default_rng(seed)
+
+    samples = np.empty((n_models, n_resamples))
+    use_counts = statistic == "mean"
+    chunk = max(1, int(max_elements // (n if use_counts else n_models * n)))
+    for start in range(0, n_resamples, chunk):
+        size = min(chunk, n_resamples - start)
+        index = rng.integers(0, n, size=(size, n))
+        if use_counts:
+            # 第 r 次重抽样的下标平移到 [r * n, (r + 1) * n)，一次 bincount 得到计数
+            index += np.arange(0, size * n, n)[:, None]
+            counts = np.bincount(index.ravel(), minlength=size * n)
+            counts = counts.reshape(size, n).astype(float)
+            samples[:, start : start + size] = values @ counts.T / n
+        else:
+            samples[:, start : start + size] = func(values[:, index])
+    return samples
+
+
+def bootstrap_ci(
+    values,
+    statistic="mean",
+    n_resamples=10000,
+    confidence=0.95,
+    seed=None,
+    max_elements=1_000_000,
+    samples=None,
+):
+    """对每个模型的统计量做自助法百分位置信区间
+
+    samples 为已有的 bootstrap_samples() 结果，给定时不再重抽样。
+    返回字典：estimate、low、high，均为长度 M 的数组。
+    """
+    values = _as_matrix(values)
+    func = STATISTICS[statistic] if isinstance(statistic, str) else statistic
+    if samples is None:
+        samples = bootstrap_samples(values, statistic, n_resamples, seed, max_elements)
+    alpha = (1 - confidence) / 2 * 100
+    low, high = np.percentile(samples, [alpha, 100 - alpha], axis=1)
+    return {"estimate": func(values), "low": low, "high": high}
+
+
+def paired_differences(
+    values, names, samples=None, confidence=0.95, **bootstrap_kwargs
+):
+    """模型两两配对差值 values[i] - values[j] 的统计
+
+    samples 为 values 均值的 bootstrap_samples() 结果，给定时差值均值的
+    重抽样直接取 samples[i] - samples[j]（同一组重抽样下均值之差即差值之均值），
+    否则对差值矩阵重新抽样。
+
+    返回列表，每项为字典：pair、mean、std、win_rate（i 优于 j，即差值 < 0 的
+    场景比例）、low / high（差值均值的自助法置信区间）。
+    """
+    values = _as_matrix(values)
+    pairs = [(i, j) for i in range(len(values)) for j in range(i + 1, len(values))]
+    if not pairs:
+        return []
+    first = [i for i, _ in pairs]
+    second = [j for _, j in pairs]
+    diff = values[first] - values[second]
+    summary = summarize(diff)
+    if samples is not None:
+        samples = samples[first] - samples[second]
+    ci = bootstrap_ci(
+        diff, "mean", confidence=confidence, samples=samples, **bootstrap_kwargs
+    )
+    win_rate = (diff < 0).mean(axis=1)
+    return [
+        {
+            "pair": (names[i], names[j]),
+            "mean": summary["mean"][k],
+            "std": summary["std"][k],
+            "win_rate": win_rate[k],
+            "low": ci["low"][k],
+            "high": ci["high"][k],
+        }
+        for k, (i, j) in enumerate(pairs)
+    ]
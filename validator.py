@@ -0,0 +1,317 @@
+"""调度方案校验
+
+把各模型的结果统一成“任务 + 放置片段”的数组形式，然后用 NumPy 规约一次性
+检查所有约束：
+
+    任务（task）：能耗 task_energy、发布小时 task_release、可用窗口 task_window
+                （高紧急任务窗口为 1，中低任务为 24，均按 24 小时循环）
+    片段（piece）：任务在某小时实际使用的绿电/传统电力，piece_task 指向任务，
+                 piece_hour 为所在小时（-1 表示未安排）
+
+检查项：
+    每小时绿电用量不超过新能源供应量；
+    每小时总用电量不超过机房容量（给定 capacity 时）；
+    每个任务的绿电 + 传统电力恰好等于其能耗（完成覆盖）；
+    每个片段都落在任务的 24 小时完成窗口内，且用量非负；
+    标记为不可拆分（task_single）的任务只能有一个有用量的片段。
+
+所有数组可带前导场景维 (S, ...)，stack_cases() 把多个场景补齐后堆叠，
+validate() 对整批场景只做几次 bincount 和比较，适合在大规模扫描中逐个校验结果。
+"""
+
+import numpy as np
+
+from data_io import HOURS, TASK_ENERGY, hourly_array
+
+
+def make_case(
+    supply,
+    task_energy,
+    task_release,
+    task_window,
+    piece_task,
+    piece_hour,
+    piece_green,
+    piece_trad,
+    capacity=None,
+    task_single=None,
+):
+    """组装一个场景的校验输入
+
+    task_single 为每个任务是否必须在单个小时内完成（默认都可拆分）。
+    """
+    supply = hourly_array(supply)
+    n_tasks = len(task_energy)
+    return {
+        "supply": supply,
+        "capacity": np.broadcast_to(
+            np.inf if capacity is None else hourly_array(capacity), supply.shape
+        ).astype(float),
+        "task_energy": np.asarray(task_energy, dtype=float),
+        "task_release": np.asarray(task_release, dtype=int),
+        "task_window": np.asarray(task_window, dtype=int),
+        "task_single": np.broadcast_to(
+            False if task_single is None else np.asarray(task_single, dtype=bool),
+            n_tasks,
+        ).copy(),
+        "piece_task": np.asarray(piece_task, dtype=int),
+        "piece_hour": np.asarray(piece_hour, dtype=int),
+        "piece_green": np.asarray(piece_green, dtype=float),
+        "piece_trad": np.asarray(piece_trad, dtype=float),
+    }
+
+
+def case_from_problem1(
+    tradition_price, new_energy_price, new_energy_supply, periods, capacity=None
+):
+    """问题1：取 calculate_cost 给出的每小时传统电量和绿电使用率
+
+    每小时的绿电 = 使用率 * 该小时负荷，按任务能耗比例分摊到该小时的各类任务，
+    因此 calculate_cost 的输出若超出供应或与负荷不符都会被查出。
+    """
+    import problem1
+
+    hours_tasks = problem1.split_periods(periods)
+    _, usage_rates, traditional_usage = problem1.calculate_cost(
+        tradition_price, new_energy_price, new_energy_supply, hours_tasks
+    )
+    energy, release, green, trad = [], [], [], []
+    for h in range(HOURS):
+        load = sum(hours_tasks[h][kind] * e for kind, e in TASK_ENERGY.items())
+        green_share = usage_rates[h] / 100 if load > 0 else 0.0
+        trad_share = traditional_usage[h] / load if load > 0 else 0.0
+        for kind, e in TASK_ENERGY.items():
+            energy.append(hours_tasks[h][kind] * e)
+            release.append(h)
+            green.append(energy[-1] * green_share)
+            trad.append(energy[-1] * trad_share)
+    n = len(energy)
+    return make_case(
+        new_energy_supply,
+        energy,
+        release,
+        np.ones(n, dtype=int),
+        np.arange(n),
+        release,
+        green,
+        trad,
+        capacity,
+    )
+
+
+def case_from_problem2(
+    tradition_price, new_energy_price, new_energy_supply, periods, capacity=None
+):
+    """问题2：高任务按小时汇总，中低任务取 schedule_tasks 的逐任务放置"""
+    import problem2
+
+    high_tasks, mid_tasks, low_tasks = problem2.split_periods(periods)
+    high_consumption, *_, mid_placements, low_placements = problem2.schedule_tasks(
+        tradition_price,
+        new_energy_price,
+        new_energy_supply,
+        high_tasks,
+        mid_tasks,
+        low_tasks,
+    )
+
+    energy, release, window, pieces = [], [], [], []
+    for h in range(HOURS):
+        energy.append(high_tasks.get(h, 0) * TASK_ENERGY["high"])
+        release.append(h)
+        window.append(1)
+        pieces.append((h, *high_consumption[h]))
+    for kind, tasks, placements in (
+        ("mid", mid_tasks, mid_placements),
+        ("low", low_tasks, low_placements),
+    ):
+        for (count, publish_hour), placement in zip(tasks, placements):
+            energy.append(count * TASK_ENERGY[kind])
+            release.append(publish_hour)
+            window.append(HOURS)
+            pieces.append(placement)
+
+    hour, green, trad = zip(*pieces)
+    return make_case(
+        new_energy_supply,
+        energy,
+        release,
+        window,
+        np.arange(len(energy)),
+        hour,
+        green,
+        trad,
+        capacity,
+    )
+
+
+def case_from_problem3(new_energy_supply, periods, placements, capacity=None):
+    """问题3：placements 为 build_and_solve_model(return_placements=True) 的结果
+
+    子任务在多个小时都有用量时拆成多个片段，覆盖检查按任务汇总。
+    """
+    import problem3
+
+    high_tasks, mid_subtasks, low_subtasks = problem3.split_periods(periods)
+    energy, release, window, single = [], [], [], []
+    piece_task, hour, green, trad = [], [], [], []
+    for h in range(HOURS):
+        piece_task.append(len(energy))
+        hour.append(h)
+        g, t = placements["high"][h]
+        green.append(g or 0.0)
+        trad.append(t or 0.0)
+        energy.append(high_tasks.get(h, 0) * TASK_ENERGY["high"])
+        release.append(h)
+        window.append(1)
+        single.append(False)
+
+    for kind, subtasks in (("mid", mid_subtasks), ("low", low_subtasks)):
+        for (task_energy, pub_hour), usage in zip(subtasks, placements[kind]):
+            for h, (g, t) in usage.items():
+                if g or t:
+                    piece_task.append(len(energy))
+                    hour.append(h)
+                    green.append(g or 0.0)
+                    trad.append(t or 0.0)
+            energy.append(task_energy)
+            release.append(pub_hour)
+            window.append(HOURS)
+            # 每个子任务只能在一个小时内完成
+            single.append(True)
+
+    return make_case(
+        new_energy_supply,
+        energy,
+        release,
+        window,
+        piece_task,
+        hour,
+        green,
+        trad,
+        capacity,
+        single,
+    )
+
+
+def case_from_jobs(new_energy_supply, jobs, result, capacity=None):
+    """job_scheduler：每个作业一个片段，未安排的作业 slot 为 -1"""
+    return make_case(
+        new_energy_supply,
+        jobs["energy"],
+        jobs["release"],
+        np.minimum(np.asarray(jobs["deadline"]) - jobs["release"], HOURS),
+        np.arange(len(jobs["energy"])),
+        result["slot"],
+        result["green"],
+        result["trad"],
+        capacity,
+    )
+
+
+def stack_cases(cases):
+    """把多个场景补齐到相同的任务数/片段数后堆叠为 (S, ...) 数组
+
+    补齐的任务能耗为 0、补齐的片段用量为 0，不会产生违规。每个字段先按补齐值
+    一次性分配，再把所有场景拼接后的数据按掩码写入，不逐场景 pad。
+    """
+    batch = {
+        key: np.stack([case[key] for case in cases]) for key in ("supply", "capacity")
+    }
+    for keys, fills in (
+        (
+            ("task_energy", "task_release", "task_window", "task_single"),
+            (0.0, 0, HOURS, False),
+        ),
+        (
+            ("piece_task", "piece_hour", "piece_green", "piece_trad"),
+            (0, 0, 0.0, 0.0),
+        ),
+    ):
+        lengths = np.array([len(case[keys[0]]) for case in cases])
+        mask = np.arange(lengths.max(initial=0)) < lengths[:, None]
+        for key, fill in zip(keys, fills):
+            values = np.concatenate([case[key] for case in cases])
+            batch[key] = np.full(mask.shape, fill, dtype=values.dtype)
+            batch[key][mask] = values
+    return batch
+
+
+def validate(case, tol=1e-6):
+    """校验一个或一批场景，tol 为相对容差
+
+    返回字典（场景维 S 在前）：
+        ok: (S,) 是否全部满足
+        hour_violation: (S, 24) 该小时是否超出绿电供应或容量
+        green_excess / capacity_excess: (S, 24) 超出绿电供应 / 容量的电量
+        task_violation: (S, N) 该任务是否有任何违规
+        task_shortfall: (S, N) 能耗减去已安排电量（正为未完成，负为重复安排）
+        out_of_window: (S, N) 任务是否有片段落在 24 小时窗口外或未安排
+        negative: (S, N) 任务是否有负用量
+        split: (S, N) 不可拆分的任务是否有多个有用量的片段
+        green_used / load: (S, 24) 每小时绿电用量和总用电量
+    """
+    supply = np.atleast_2d(case["supply"])
+    capacity = np.atleast_2d(case["capacity"])
+    energy = np.atleast_2d(case["task_energy"])
+    release = np.atleast_2d(case["task_release"])
+    window = np.atleast_2d(case["task_window"])
+    single = np.atleast_2d(case["task_single"])
+    piece_task = np.atleast_2d(case["piece_task"])
+    piece_hour = np.atleast_2d(case["piece_hour"])
+    green = np.atleast_2d(case["piece_green"])
+    trad = np.atleast_2d(case["piece_trad"])
+    n_scenarios, n_tasks = energy.shape
+    rows = np.arange(n_scenarios)[:, None]
+
+    # 每小时汇总
+    placed = (piece_hour >= 0) & (piece_hour < HOURS)
+    hour = np.where(placed, piece_hour, 0)
+    hour_index = (rows * HOURS + hour).ravel()
+    size = n_scenarios * HOURS
+    green_used = np.bincount(hour_index, (green * placed).ravel(), size)
+    load = np.bincount(hour_index, ((green + trad) * placed).ravel(), size)
+    green_used = green_used.reshape(n_scenarios, HOURS)
+    load = load.reshape(n_scenarios, HOURS)
+
+    green_excess = np.maximum(green_used - supply, 0.0)
+    capacity_excess = np.maximum(load - capacity, 0.0)
+    hour_violation = (green_excess > tol * np.maximum(supply, 1.0)) | (
+        capacity_excess > tol * np.maximum(capacity, 1.0)
+    )
+
+    # 每个任务汇总
+    task_index = (rows * n_tasks + piece_task).ravel()
+    size = n_scenarios * n_tasks
+    covered = np.bincount(task_index, ((green + trad) * placed).ravel(), size)
+    task_shortfall = energy - covered.reshape(n_scenarios, n_tasks)
+
+    active = (np.abs(green) > tol) | (np.abs(trad) > tol)
+    offset = (hour - np.take_along_axis(release, piece_task, axis=1)) % HOURS
+    outside = active & (~placed | (offset >= np.take_along_axis(window, piece_task, 1)))
+    out_of_window = np.bincount(task_index, outside.ravel(), size) > 0
+    negative = np.bincount(task_index, ((green < -tol) | (trad < -tol)).ravel(), size)
+    out_of_window = out_of_window.reshape(n_scenarios, n_tasks)
+    negative = negative.reshape(n_scenarios, n_tasks) > 0
+    pieces = np.bincount(task_index, active.ravel(), size)
+    split = single & (pieces.reshape(n_scenarios, n_tasks) > 1)
+
+    task_violation = (
+        (np.abs(task_shortfall) > tol * np.maximum(energy, 1.0))
+        | out_of_window
+        | negative
+        | split
+    )
+    return {
+        "ok": ~hour_violation.any(axis=1) & ~task_violation.any(axis=1),
+        "hour_violation": hour_violation,
+        "green_excess": green_excess,
+        "capacity_excess": capacity_excess,
+        "task_violation": task_violation,
+        "task_shortfall": task_shortfall,
+        "out_of_window": out_of_window,
+        "negative": negative,
+        "split": split,
+        "green_used": green_used,
+        "load": load,
+    }